@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Latency harness for the hooks.
+
+Replays a corpus of prompts through each hook configuration and reports
+wall time (p50/p95/p99) and the number of processes each run creates.
+Processes are counted from the kernel's fork counter (/proc/stat), which
+is system-wide, so run on a quiet machine; each figure is the median over
+runs, excluding the hook's own process. The counter is Linux-only; on other
+systems the column shows '-'.
+
+    python3 hooks/bench_hooks.py                          # corpus: rank-eval-prompts.jsonl
+    python3 hooks/bench_hooks.py --prompts prompts.txt --repeat 5
+    python3 hooks/bench_hooks.py --grow 10                # triggers file 10x larger
+    python3 hooks/bench_hooks.py --log ~/.claude/hook-timing.jsonl
+
+The corpus is JSONL with a "prompt" field, or plain text with one prompt per
+line. --log summarises a timing log written by the hooks (SKILL_HOOK_LOG)
+instead of running anything.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(HOOKS_DIR)
+
+# (label, hook script, extra environment)
+CONFIGS = [
+    ("context-loader (python)", "context-loader-hook.sh", {}),
+    ("context-loader (shell)", "context-loader-hook.sh", {"SKILL_HOOK_PYTHON": "no-python"}),
+    ("forced-eval (all)", "skill-forced-eval-hook.sh", {}),
+    ("forced-eval (top-5)", "skill-forced-eval-hook.sh", {"SKILL_EVAL_TOP_K": "5"}),
+]
+
+
+def load_prompts(path: str) -> List[str]:
+    prompts = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                prompts.append(json.loads(line)["prompt"])
+            else:
+                prompts.append(line)
+    return prompts
+
+
+def grow_triggers(path: str, factor: int, out_dir: str) -> str:
+    """Copy of the triggers file with every trigger repeated factor times under new keywords."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f.read().splitlines() if line.strip() and not line.startswith("#")]
+    grown = list(lines)
+    for n in range(1, factor):
+        for line in lines:
+            pattern, _, skills = line.rpartition(":")
+            grown.append("|".join(f"{word}{n}" for word in pattern.split("|")) + ":" + skills)
+    out = os.path.join(out_dir, "skill-triggers.yaml")
+    with open(out, "w", encoding="utf-8") as f:
+        f.write("\n".join(grown) + "\n")
+    return out
+
+
+def fork_counter() -> Optional[int]:
+    try:
+        with open("/proc/stat") as f:
+            for line in f:
+                if line.startswith("processes "):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def run_hook(script: str, prompt: str, env: Dict[str, str]) -> Tuple[float, Optional[int]]:
+    """(wall ms, processes created by the hook beyond its own) for one run."""
+    before = fork_counter()
+    start = time.perf_counter()
+    subprocess.run(["bash", os.path.join(HOOKS_DIR, script)], input=prompt, text=True,
+                   env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=REPO_ROOT)
+    elapsed = (time.perf_counter() - start) * 1000
+    after = fork_counter()
+    forks = None if before is None or after is None else max(0, after - before - 1)
+    return elapsed, forks
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def report_row(label: str, times: List[float], forks: List[int]) -> str:
+    fork_text = f"{statistics.median(forks):6.0f}" if forks else f"{'-':>6}"
+    return (f"{label:<26} {len(times):5d} {percentile(times, 50):8.1f} {percentile(times, 95):8.1f} "
+            f"{percentile(times, 99):8.1f} {fork_text}")
+
+
+HEADER = f"{'hook':<26} {'runs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'forks':>6}"
+
+
+def summarise_log(path: str) -> int:
+    """p50/p95/p99 per hook and engine from a SKILL_HOOK_LOG file."""
+    groups: Dict[str, List[float]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            groups.setdefault(f"{record['hook']} ({record['engine']})", []).append(record["ms"])
+    if not groups:
+        print(f"No timing records in {path}")
+        return 1
+    print(HEADER)
+    for label, times in sorted(groups.items()):
+        print(report_row(label, times, []))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-event hook latency")
+    parser.add_argument("--prompts", default=os.path.join(HOOKS_DIR, "rank-eval-prompts.jsonl"),
+                        help="Prompt corpus (JSONL with 'prompt', or one prompt per line)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per hook")
+    parser.add_argument("--triggers", default=os.path.join(HOOKS_DIR, "skill-triggers.yaml"))
+    parser.add_argument("--skills-dir", default=os.path.join(REPO_ROOT, "skills"))
+    parser.add_argument("--grow", type=int, default=1, metavar="N",
+                        help="Benchmark with the triggers file grown N times")
+    parser.add_argument("--log", metavar="FILE", help="Summarise a SKILL_HOOK_LOG file and exit")
+    args = parser.parse_args()
+
+    if args.log:
+        return summarise_log(args.log)
+
+    prompts = load_prompts(args.prompts)
+    if not prompts:
+        print(f"Error: no prompts in {args.prompts}", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        triggers = grow_triggers(args.triggers, args.grow, tmp) if args.grow > 1 else args.triggers
+        base_env = {key: value for key, value in os.environ.items()
+                    if key not in ("SKILL_HOOK_LOG", "SKILL_EVAL_TOP_K", "SKILL_HOOK_PYTHON")}
+        base_env.update(TRIGGERS_FILE=os.path.abspath(triggers), SKILLS_DIR=os.path.abspath(args.skills_dir))
+
+        print(f"{len(prompts)} prompts x {args.repeat} passes, triggers: {triggers}\n")
+        print(HEADER)
+        for label, script, extra in CONFIGS:
+            env = dict(base_env, **extra)
+            run_hook(script, prompts[0], env)  # warm-up: page cache, bytecode, skill index
+            times, forks = [], []
+            for _ in range(args.repeat):
+                for prompt in prompts:
+                    elapsed, created = run_hook(script, prompt, env)
+                    times.append(elapsed)
+                    if created is not None:
+                        forks.append(created)
+            print(report_row(label, times, forks))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark top-k skill selection against full forced evaluation.
+
+For a labelled prompt set (JSONL of {"prompt": ..., "skills": [...]}) this
+reports, per k:
+- recall: the share of labelled skills that make the top k;
+- tokens: estimated injected and evaluation-output tokens per prompt.
+The same figures are given for the full hook, which has every installed
+skill evaluated.
+
+Tokens are estimated at 4 characters per token. Output is estimated as one
+"- skill: YES/NO - reason" line per evaluated skill.
+
+Usage:
+    python3 hooks/bench_rank.py
+    python3 hooks/bench_rank.py --prompts my-prompts.jsonl --k 3 5 8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import time
+
+from rank_skills import SkillIndex, format_protocol, load_triggers, rank
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+AVERAGE_CHARS_PER_TOKEN = 4  # conservative heuristic
+
+# A typical evaluation line written for each evaluated skill
+SAMPLE_EVALUATION = "- careful-delete: NO - the request does not delete or overwrite anything\n"
+
+
+def tokens(text: str) -> float:
+    return len(text) / AVERAGE_CHARS_PER_TOKEN
+
+
+def full_hook_output() -> str:
+    env = {key: value for key, value in os.environ.items() if key != "SKILL_EVAL_TOP_K"}
+    return subprocess.run(["bash", os.path.join(HOOKS_DIR, "skill-forced-eval-hook.sh")],
+                          env=env, capture_output=True, text=True, check=True).stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark top-k skill selection")
+    parser.add_argument("--prompts", default=os.path.join(HOOKS_DIR, "rank-eval-prompts.jsonl"),
+                        help="Labelled prompt set (JSONL)")
+    parser.add_argument("--skills-dir", default=os.environ.get("SKILLS_DIR", "skills"))
+    parser.add_argument("--triggers", default=os.path.join(HOOKS_DIR, "skill-triggers.yaml"))
+    parser.add_argument("--k", type=int, nargs="+", default=[3, 5, 8])
+    parser.add_argument("--misses", action="store_true", help="List labelled skills missed at each k")
+    args = parser.parse_args()
+
+    with open(args.prompts, encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+    index = SkillIndex(args.skills_dir)
+    triggers = load_triggers(args.triggers)
+    per_evaluation = tokens(SAMPLE_EVALUATION)
+
+    installed = len(index.names())
+    full_in = tokens(full_hook_output())
+    full_out = installed * per_evaluation
+    print(f"{len(cases)} labelled prompts, {installed} installed skills\n")
+    print(f"{'mode':<10} {'recall':>7} {'in tok':>7} {'out tok':>8} {'total':>7} {'saved':>6} {'rank ms':>8}")
+    print(f"{'full':<10} {1:7.0%} {full_in:7.0f} {full_out:8.0f} {full_in + full_out:7.0f} {'':>6} {'':>8}")
+
+    for k in args.k:
+        found = labelled = 0
+        injected, output, latencies, misses = [], [], [], []
+        for case in cases:
+            start = time.perf_counter()
+            candidates = rank(case["prompt"], index, triggers, k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            names = {name for name, _ in candidates}
+            found += len(names & set(case["skills"]))
+            labelled += len(case["skills"])
+            misses += [(case["prompt"], skill) for skill in case["skills"] if skill not in names]
+            injected.append(tokens(format_protocol(candidates, index)))
+            output.append(len(candidates) * per_evaluation)
+
+        total = statistics.mean(injected) + statistics.mean(output)
+        saved = 1 - total / (full_in + full_out)
+        print(f"{'top-' + str(k):<10} {found / labelled:7.0%} {statistics.mean(injected):7.0f} "
+              f"{statistics.mean(output):8.0f} {total:7.0f} {saved:6.0%} {statistics.median(latencies):8.2f}")
+        if args.misses:
+            for prompt, skill in misses:
+                print(f"    missed {skill}: {prompt}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
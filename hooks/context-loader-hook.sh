@@ -10,10 +10,25 @@
 #          Touching auth code → suggest threat-model, prove-it
 #
 # This hook runs on UserPromptSubmit and PreToolUse events.
+# When python3 is available, matching is done by match_triggers.py (next to
+# this script) in a single process; the shell loop below is the fallback.
 
 # Configuration
 TRIGGERS_FILE="${TRIGGERS_FILE:-.claude/skill-triggers.yaml}"
 SKILLS_DIR="${SKILLS_DIR:-skills}"
+PYTHON="${SKILL_HOOK_PYTHON:-python3}"  # set to a missing command to force the shell fallback
+
+# Optional timing log: with SKILL_HOOK_LOG set, append one JSONL record per run
+# (see hook_log.py; $EPOCHREALTIME needs bash 5)
+HOOK_START="$EPOCHREALTIME"
+log_timing() {  # log_timing <engine> [skills]
+    [[ -n "$SKILL_HOOK_LOG" && -n "$HOOK_START" ]] || return 0
+    local start="${HOOK_START/[.,]/}" end="${EPOCHREALTIME/[.,]/}"
+    local us=$(( 10#$end - 10#$start ))
+    printf '{"ts": %s, "hook": "%s", "engine": "%s", "ms": %d.%03d%s}\n' \
+        "${EPOCHREALTIME/,/.}" "context-loader" "$1" $(( us / 1000 )) $(( us % 1000 )) "${2:+, \"skills\": $2}" \
+        >> "$SKILL_HOOK_LOG" 2>/dev/null
+}
 
 # Check if we have a triggers file
 if [[ ! -f "$TRIGGERS_FILE" ]]; then
@@ -21,6 +36,13 @@ if [[ ! -f "$TRIGGERS_FILE" ]]; then
     exit 0
 fi
 
+MATCHER="${BASH_SOURCE[0]%/*}/match_triggers.py"
+if [[ -f "$MATCHER" ]] && command -v "$PYTHON" >/dev/null 2>&1; then
+    export TRIGGERS_FILE SKILLS_DIR
+    [[ -n "$SKILL_HOOK_LOG" ]] && export SKILL_HOOK_START="$HOOK_START"
+    exec "$PYTHON" -S "$MATCHER"
+fi
+
 # Function to check if a command mentions certain paths
 check_file_context() {
     local prompt="$1"
@@ -79,3 +101,6 @@ These are suggestions based on file context, not mandatory.
 
 EOF
 fi
+
+SUGGESTED=($MATCHING_SKILLS)
+log_timing shell "${#SUGGESTED[@]}"
@@ -0,0 +1,43 @@
+"""
+Optional JSONL timing log for the hooks.
+
+When SKILL_HOOK_LOG names a file, each hook run appends one line:
+
+    {"ts": 1760000000.123, "hook": "context-loader", "engine": "python", "ms": 21.4, "skills": 3}
+
+ms runs from SKILL_HOOK_START (the shell hook's $EPOCHREALTIME, exported
+before it hands over to Python) to the end of the run. Without it, ms is
+measured from when this module was imported. bench_hooks.py --log
+summarises a log file.
+"""
+
+import os
+import time
+
+LOG_PATH = os.environ.get("SKILL_HOOK_LOG", "")
+
+_imported = time.time()
+
+
+def hook_start() -> float:
+    """Epoch seconds at which the hook started."""
+    try:
+        return float(os.environ["SKILL_HOOK_START"].replace(",", "."))
+    except (KeyError, ValueError):
+        return _imported
+
+
+def log_timing(hook: str, engine: str, **fields) -> None:
+    """Append a timing record if SKILL_HOOK_LOG is set; never fails the hook."""
+    if not LOG_PATH:
+        return
+    import json
+
+    now = time.time()
+    record = {"ts": round(now, 3), "hook": hook, "engine": engine,
+              "ms": round((now - hook_start()) * 1000, 3), **fields}
+    try:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
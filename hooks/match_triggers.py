@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Trigger matcher for context-loader-hook.sh.
+
+Reads skill-triggers.yaml once, compiles every trigger into a single regex,
+and finds all matching skills for a prompt in one pass, printing the same
+suggestion block the shell loop did. The compiled matcher is memoised per
+triggers file and rebuilt when the file's mtime or size changes.
+
+Skill descriptions come from the index kept by skill_index.py. Stdlib only,
+and little of it at import, since this runs on every prompt and tool call:
+
+    echo "fix the login endpoint" | python3 -S hooks/match_triggers.py
+    python3 -S hooks/match_triggers.py --bench
+"""
+
+import os
+import re
+import sys
+
+from hook_log import log_timing
+from skill_index import SkillIndex
+
+TRIGGERS_FILE = os.environ.get("TRIGGERS_FILE", ".claude/skill-triggers.yaml")
+SKILLS_DIR = os.environ.get("SKILLS_DIR", "skills")
+
+# Load + compile + match must stay under this on a typical prompt
+LATENCY_BUDGET_MS = 5.0
+
+# Description lines shown per suggested skill
+DESCRIPTION_LINES = 2
+
+# (path, mtime_ns, size) -> TriggerMatcher
+_matchers: dict = {}
+
+
+def parse_triggers(text: str) -> list:
+    """(pattern, [skills]) per line of 'pattern: skill1, skill2'.
+
+    Split on the last colon, so patterns may contain spaces ('drop table').
+    """
+    triggers = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        pattern, sep, skills = line.rpartition(":")
+        pattern = pattern.strip()
+        if not sep or not pattern:
+            continue
+        triggers.append((pattern, skills.replace(",", " ").split()))
+    return triggers
+
+
+def _lowercase_literals(pattern: str) -> str:
+    """Lowercase a regex, leaving escape sequences like \\S or \\W untouched."""
+    out = []
+    escaped = False
+    for ch in pattern:
+        out.append(ch if escaped else ch.lower())
+        escaped = ch == "\\" and not escaped
+    return "".join(out)
+
+
+class TriggerMatcher:
+    """All triggers compiled into one regex; match() returns sorted, deduplicated skills.
+
+    The regex stops only where some trigger matches, and there tries every
+    trigger as an optional lookahead, so one finditer() reports every trigger
+    even when several match at the same spot ('drop' and 'drop table').
+    Patterns and prompt are lowercased instead of using re.IGNORECASE, which
+    is several times slower to match.
+    """
+
+    def __init__(self, triggers: list):
+        patterns = [_lowercase_literals(pattern) for pattern, _ in triggers]
+        try:
+            self.regex, self.triggers = self._compile(patterns), list(triggers)
+        except re.error:
+            # Drop invalid patterns (the grep loop skipped them too) and retry
+            valid = [i for i, pattern in enumerate(patterns) if self._valid(pattern)]
+            self.regex = self._compile([patterns[i] for i in valid])
+            self.triggers = [triggers[i] for i in valid]
+
+    @staticmethod
+    def _valid(pattern: str) -> bool:
+        try:
+            re.compile(pattern)
+            return True
+        except re.error:
+            return False
+
+    @staticmethod
+    def _compile(patterns: list):
+        if not patterns:
+            return None
+        any_trigger = "|".join(patterns)
+        each_trigger = "".join(f"(?=(?P<t{i}>{pattern}))?" for i, pattern in enumerate(patterns))
+        return re.compile(f"(?=(?:{any_trigger})){each_trigger}")
+
+    def match(self, prompt: str) -> list:
+        if self.regex is None:
+            return []
+        found = set()
+        for m in self.regex.finditer(prompt.lower()):
+            found.update(name for name, text in m.groupdict().items() if text is not None)
+        return sorted({skill for name in found for skill in self.triggers[int(name[1:])][1]})
+
+
+def load_matcher(path: str) -> TriggerMatcher:
+    """Compiled matcher for a triggers file, reused while the file is unchanged."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        with open(path, encoding="utf-8") as f:
+            matcher = TriggerMatcher(parse_triggers(f.read()))
+        _matchers.clear()
+        _matchers[key] = matcher
+    return matcher
+
+
+def format_suggestions(skills: list, skills_dir: str = SKILLS_DIR) -> str:
+    if not skills:
+        return ""
+    index = SkillIndex(skills_dir) if os.path.isdir(skills_dir) else None
+    out = ["", "CONTEXT-AWARE SKILL SUGGESTION", "",
+           "Based on the files/patterns in your request, consider these skills:", ""]
+    for skill in skills:
+        out.append(f"• {skill}")
+        entry = index.get(skill) if index else None
+        if entry and entry["description"]:
+            out.extend(f"  {line}" for line in entry["description"].split("\n")[:DESCRIPTION_LINES])
+            out.append("")
+    out += ["To activate: Use the Skill() tool with the skill name.",
+            "These are suggestions based on file context, not mandatory.", "", ""]
+    return "\n".join(out)
+
+
+def bench(path: str) -> int:
+    """Time a cold load+match and a warm match; exit status 1 if over budget."""
+    from time import perf_counter
+
+    prompts = ["Fix the login endpoint so the auth token refresh stops failing",
+               "drop table users and force push the migration",
+               "hello there " * 200]
+    start = perf_counter()
+    _matchers.clear()
+    load_matcher(path).match(prompts[0])
+    cold = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    for prompt in prompts:
+        load_matcher(path).match(prompt)
+    warm = (perf_counter() - start) * 1000 / len(prompts)
+
+    print(f"cold load+match: {cold:.2f} ms, warm match: {warm:.3f} ms "
+          f"(budget {LATENCY_BUDGET_MS:.0f} ms)")
+    return 1 if cold > LATENCY_BUDGET_MS else 0
+
+
+def main():
+    if not os.path.isfile(TRIGGERS_FILE):
+        return 0  # no triggers file - silently exit
+    if sys.argv[1:] == ["--bench"]:
+        return bench(TRIGGERS_FILE)
+
+    prompt = os.environ.get("CLAUDE_PROMPT") or sys.stdin.read()
+    skills = load_matcher(TRIGGERS_FILE).match(prompt)
+    sys.stdout.write(format_suggestions(skills))
+    log_timing("context-loader", "python", skills=len(skills))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Top-k skill selection for skill-forced-eval-hook.sh.
+
+Scores every installed skill against the prompt with BM25 over the skill's
+name, SKILL.md description (from skill_index.py) and the trigger patterns
+that point at it in skill-triggers.yaml, then prints the forced-evaluation
+protocol for the k best candidates only. Evaluating a handful of candidates
+instead of every skill keeps prompt and output tokens flat as skills are
+added.
+
+    echo "drop the users table" | SKILL_EVAL_TOP_K=5 python3 -S hooks/rank_skills.py
+"""
+
+import math
+import os
+import re
+import sys
+
+from hook_log import log_timing
+from match_triggers import parse_triggers
+from skill_index import SkillIndex
+
+SKILLS_DIR = os.environ.get("SKILLS_DIR", "skills")
+TRIGGERS_FILE = os.environ.get("TRIGGERS_FILE", ".claude/skill-triggers.yaml")
+
+# Candidates put forward for evaluation
+DEFAULT_TOP_K = 5
+
+# BM25 term-frequency saturation and length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Field weights: a term in the skill name or a trigger counts this many times
+NAME_WEIGHT = 3
+TRIGGER_WEIGHT = 2
+
+# Longest description excerpt shown per candidate
+SUMMARY_CHARS = 110
+
+# Question words ("where is", "should we") are kept: several skills trigger on them
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have i if in into is it its
+me my no not of on or our so than that the their then there these this to up us was
+we will with you your
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word stems, stopwords dropped ('failing', 'fails' -> 'fail')."""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        for suffix in ("ing", "ed", "s"):
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                word = word[:-len(suffix)]
+                break
+        terms.append(word)
+    return terms
+
+
+def skill_documents(index: SkillIndex, triggers: list) -> dict:
+    """Skill name -> weighted term list (name, triggers, description)."""
+    trigger_terms = {}
+    for pattern, skills in triggers:
+        terms = tokenize(pattern.replace("|", " "))
+        for skill in skills:
+            trigger_terms.setdefault(skill, []).extend(terms)
+
+    documents = {}
+    for name in index.names():
+        skill = index.get(name)
+        if skill is None:
+            continue
+        documents[name] = (tokenize(name.replace("-", " ")) * NAME_WEIGHT
+                           + trigger_terms.get(name, []) * TRIGGER_WEIGHT
+                           + tokenize(skill["description"]))
+    return documents
+
+
+class BM25:
+    """Okapi BM25 over a small in-memory corpus."""
+
+    def __init__(self, documents: dict):
+        self.frequencies = {}
+        self.lengths = {}
+        document_frequency = {}
+        for name, terms in documents.items():
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            self.frequencies[name] = counts
+            self.lengths[name] = len(terms)
+            for term in counts:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        n = len(documents)
+        self.average_length = sum(self.lengths.values()) / n if n else 0.0
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+                    for term, df in document_frequency.items()}
+
+    def score(self, query: list) -> dict:
+        scores = {}
+        query_terms = set(query)
+        for name, counts in self.frequencies.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[name] / (self.average_length or 1))
+            total = 0.0
+            for term in query_terms:
+                tf = counts.get(term)
+                if tf:
+                    total += self.idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+            if total > 0:
+                scores[name] = total
+        return scores
+
+
+def load_triggers(path: str = TRIGGERS_FILE) -> list:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return parse_triggers(f.read())
+    except OSError:
+        return []
+
+
+def rank(prompt: str, index: SkillIndex, triggers: list, k: int = DEFAULT_TOP_K) -> list:
+    """Up to k (skill, score) pairs, best first; skills scoring zero are left out."""
+    scores = BM25(skill_documents(index, triggers)).score(tokenize(prompt))
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+def summary(description: str) -> str:
+    """First sentence of a description, clipped to SUMMARY_CHARS."""
+    text = " ".join(description.split())
+    sentence = text.split(". ", 1)[0].rstrip(".")
+    return sentence if len(sentence) <= SUMMARY_CHARS else sentence[:SUMMARY_CHARS - 3].rstrip() + "..."
+
+
+def format_protocol(candidates: list, index: SkillIndex) -> str:
+    """The forced-evaluation protocol, restricted to the candidate skills.
+
+    With no candidates (nothing in the prompt matches any skill) the protocol
+    is still injected, asking for every installed skill that applies.
+    """
+    lines = ["SKILL ACTIVATION PROTOCOL - MANDATORY", ""]
+    if candidates:
+        lines += ["These installed skills look relevant to this prompt:", ""]
+        for name, _ in candidates:
+            skill = index.get(name)
+            lines.append(f"- {name}: {summary(skill['description'])}" if skill else f"- {name}")
+        lines.append("")
+    lines += [
+        "Before implementing ANY request, you MUST complete these steps IN ORDER:",
+        "",
+        "Step 1 - EVALUATE: For each candidate skill above, explicitly state:" if candidates else
+        "Step 1 - EVALUATE: For each installed skill that could apply, explicitly state:",
+        "  - Skill name",
+        "  - YES or NO (does this prompt need this skill?)",
+        "  - One-sentence reason",
+        "",
+        "Step 2 - ACTIVATE: For every skill you marked YES, use the Skill() tool NOW.",
+        "  - Do not skip this step",
+        "  - Do not proceed to implementation without activation",
+        "",
+        "Step 3 - IMPLEMENT: Only after activation, proceed with the task.",
+        "",
+        "CRITICAL: The evaluation in Step 1 is WORTHLESS unless you ACTIVATE in Step 2.",
+        "If another installed skill clearly applies, evaluate it too." if candidates else
+        "No skill stood out for this prompt; evaluate any installed skill that applies.",
+        "",
+        "Format your evaluation as:",
+        "```",
+        "SKILL EVALUATION:",
+        "- skill-name-1: YES - [reason]",
+        "- skill-name-2: NO - [reason]",
+        "...",
+        "ACTIVATING: skill-name-1",
+        "```",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    try:
+        k = int(os.environ.get("SKILL_EVAL_TOP_K") or DEFAULT_TOP_K)
+    except ValueError:
+        k = DEFAULT_TOP_K
+    if not os.path.isdir(SKILLS_DIR):
+        print(f"Error: skills directory not found: {SKILLS_DIR}", file=sys.stderr)
+        return 1
+
+    prompt = os.environ.get("CLAUDE_PROMPT") or sys.stdin.read()
+    index = SkillIndex(SKILLS_DIR)
+    candidates = rank(prompt, index, load_triggers(), k)
+    sys.stdout.write(format_protocol(candidates, index))
+    log_timing("forced-eval", "python", skills=len(candidates))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,31 @@
 #
 # The key insight: creating a "commitment mechanism" where Claude must
 # explicitly state YES/NO for each skill before implementing.
+#
+# Set SKILL_EVAL_TOP_K=<k> to evaluate only the k skills most relevant to the
+# prompt (BM25 ranking by rank_skills.py) instead of every installed skill.
+
+PYTHON="${SKILL_HOOK_PYTHON:-python3}"  # set to a missing command to force the shell fallback
+
+# Optional timing log: with SKILL_HOOK_LOG set, append one JSONL record per run
+# (see hook_log.py; $EPOCHREALTIME needs bash 5)
+HOOK_START="$EPOCHREALTIME"
+log_timing() {  # log_timing <engine> [skills]
+    [[ -n "$SKILL_HOOK_LOG" && -n "$HOOK_START" ]] || return 0
+    local start="${HOOK_START/[.,]/}" end="${EPOCHREALTIME/[.,]/}"
+    local us=$(( 10#$end - 10#$start ))
+    printf '{"ts": %s, "hook": "%s", "engine": "%s", "ms": %d.%03d%s}\n' \
+        "${EPOCHREALTIME/,/.}" "forced-eval" "$1" $(( us / 1000 )) $(( us % 1000 )) "${2:+, \"skills\": $2}" \
+        >> "$SKILL_HOOK_LOG" 2>/dev/null
+}
+
+if [[ -n "$SKILL_EVAL_TOP_K" ]]; then
+    RANKER="${BASH_SOURCE[0]%/*}/rank_skills.py"
+    if [[ -f "$RANKER" && -d "${SKILLS_DIR:-skills}" ]] && command -v "$PYTHON" >/dev/null 2>&1; then
+        [[ -n "$SKILL_HOOK_LOG" ]] && export SKILL_HOOK_START="$HOOK_START"
+        exec "$PYTHON" -S "$RANKER"
+    fi
+fi
 
 cat << 'EOF'
 SKILL ACTIVATION PROTOCOL - MANDATORY
@@ -39,3 +64,5 @@ SKILL EVALUATION:
 ACTIVATING: skill-name-1
 ```
 EOF
+
+log_timing shell
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Index of SKILL.md frontmatter for the hooks.
+
+Parses every skills/<name>/SKILL.md once into a compact index file (name,
+description, allowed-tools, scripts) so hooks look skills up instead of
+re-reading and grepping SKILL.md on every event. The index is stored with
+marshal (builtin, no import cost) in <skills dir>/.skill-index.
+
+Freshness is checked per lookup rather than across every skill: a lookup
+stats the skills directory (for added or removed skills) plus the one skill's
+SKILL.md and scripts/, and rebuilds the index if any changed since indexing.
+Hook cost therefore stays flat as the number of skills grows.
+
+Usage:
+    python3 hooks/skill_index.py                 # build and list
+    python3 hooks/skill_index.py --skills-dir ~/.claude/skills
+"""
+
+import marshal
+import os
+import sys
+
+INDEX_FILE = ".skill-index"
+
+# Bump when the entry layout changes; older indexes are rebuilt
+INDEX_VERSION = 1
+
+
+def parse_frontmatter(text: str) -> dict:
+    """Top-level fields of a '---' delimited frontmatter block.
+
+    Handles the subset SKILL.md files use: 'key: value' and block scalars
+    ('key: |' or 'key: >') followed by indented lines.
+    """
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return {}
+    fields = {}
+    key, style, block = None, "", []
+    for line in lines[1:]:
+        if line.strip() == "---":
+            break
+        if key and (line.startswith((" ", "\t")) or not line.strip()):
+            block.append(line.strip())
+            continue
+        if key:
+            fields[key] = (" " if style.startswith(">") else "\n").join(block).strip()
+            key = None
+        name, sep, value = line.partition(":")
+        if not sep:
+            continue
+        value = value.strip()
+        if value in ("|", "|-", ">", ">-"):
+            key, style, block = name.strip(), value, []
+        else:
+            fields[name.strip()] = value.strip("\"'")
+    if key:
+        fields[key] = (" " if style.startswith(">") else "\n").join(block).strip()
+    return fields
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def index_skill(skill_dir: str):
+    """Index entry for one skill directory, or None if it has no SKILL.md.
+
+    Entry: (SKILL.md mtime, scripts/ mtime, name, description, allowed_tools, scripts)
+    """
+    skill_md = os.path.join(skill_dir, "SKILL.md")
+    try:
+        with open(skill_md, encoding="utf-8") as f:
+            fields = parse_frontmatter(f.read())
+    except OSError:
+        return None
+    scripts_dir = os.path.join(skill_dir, "scripts")
+    try:
+        scripts = tuple(sorted(name for name in os.listdir(scripts_dir)
+                               if not name.startswith((".", "_"))))
+    except OSError:
+        scripts = ()
+    return (_mtime(skill_md), _mtime(scripts_dir),
+            fields.get("name") or os.path.basename(skill_dir),
+            fields.get("description", ""), fields.get("allowed-tools", ""), scripts)
+
+
+def build_index(skills_dir: str) -> dict:
+    skills = {}
+    for name in sorted(os.listdir(skills_dir)):
+        if name.startswith("."):
+            continue
+        entry = index_skill(os.path.join(skills_dir, name))
+        if entry is not None:
+            skills[name] = entry
+    return {"version": INDEX_VERSION, "dir_mtime": _mtime(skills_dir), "skills": skills}
+
+
+class SkillIndex:
+    """Skill lookups backed by the index file, rebuilt when it is stale."""
+
+    def __init__(self, skills_dir: str, index_path: str = ""):
+        self.skills_dir = skills_dir
+        self.index_path = index_path or os.path.join(skills_dir, INDEX_FILE)
+        self.data = self._read()
+        if self.data is None or self.data["dir_mtime"] != _mtime(skills_dir):
+            self.rebuild()
+
+    def _read(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None  # missing, or written by another Python version
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        return data
+
+    def rebuild(self) -> None:
+        self.data = build_index(self.skills_dir)
+        try:
+            self._write()
+            dir_mtime = _mtime(self.skills_dir)
+            if dir_mtime != self.data["dir_mtime"]:
+                # Creating the index file touched the directory; rewriting in place does not
+                self.data["dir_mtime"] = dir_mtime
+                self._write()
+        except OSError:
+            pass  # read-only skills dir: serve from memory this time
+
+    def _write(self) -> None:
+        # Written in place (a concurrent reader sees a short file and rebuilds);
+        # replacing it via rename would change the directory mtime every time
+        with open(self.index_path, "wb") as f:
+            marshal.dump(self.data, f)
+
+    def _fresh(self, name: str, entry) -> bool:
+        skill_dir = os.path.join(self.skills_dir, name)
+        return (entry[0] == _mtime(os.path.join(skill_dir, "SKILL.md"))
+                and entry[1] == _mtime(os.path.join(skill_dir, "scripts")))
+
+    def get(self, name: str):
+        """{name, description, allowed_tools, scripts} for a skill, or None if unknown."""
+        entry = self.data["skills"].get(name)
+        if entry is not None and not self._fresh(name, entry):
+            self.rebuild()
+            entry = self.data["skills"].get(name)
+        if entry is None:
+            return None
+        return {"name": entry[2], "description": entry[3],
+                "allowed_tools": entry[4], "scripts": list(entry[5])}
+
+    def names(self) -> list:
+        return list(self.data["skills"])
+
+
+def main():
+    skills_dir = os.environ.get("SKILLS_DIR", "skills")
+    if sys.argv[1:2] == ["--skills-dir"] and len(sys.argv) > 2:
+        skills_dir = os.path.expanduser(sys.argv[2])
+    if not os.path.isdir(skills_dir):
+        print(f"Error: skills directory not found: {skills_dir}", file=sys.stderr)
+        return 1
+
+    index = SkillIndex(skills_dir)
+    index.rebuild()
+    for name in index.names():
+        skill = index.get(name)
+        summary = skill["description"].split("\n", 1)[0]
+        scripts = f" [{', '.join(skill['scripts'])}]" if skill["scripts"] else ""
+        print(f"{name}: {summary[:70]}{scripts}")
+    print(f"\nIndexed {len(index.names())} skills into {index.index_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Check that modules shipped in several skills are identical copies.
+
+Skills are installed one directory at a time, so a module several skills
+need is copied into each of them. The copies must not drift: the skill
+daemon puts every skill's scripts/ on sys.path, and the first copy found
+shadows the others, so a drifted copy would behave differently under the
+daemon than when its script runs directly.
+
+The first skill listed for a module holds the canonical copy; edit that one
+and run with --sync to copy it to the others. Exit status is 1 when any copy
+differs (or is missing), so this can run as a pre-commit hook or in CI.
+
+Usage:
+    python scripts/check_shared.py
+    python scripts/check_shared.py --sync
+"""
+
+import argparse
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (module, skills shipping it); the first skill holds the canonical copy
+SHARED_MODULES = [
+    ('scan_core.py', ['eta', 'pre-mortem', 'loose-ends']),
+    ('file_cache.py', ['eta', 'pre-mortem', 'loose-ends']),
+    ('run_tasks.py', ['fan-out', 'map-reduce', 'pipeline']),
+]
+
+
+def digest(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    except OSError:
+        return None
+
+
+def check(module: str, skills: List[str]) -> List[Tuple[str, Optional[str]]]:
+    """(skill, digest) for every copy that differs from the canonical one (all, if it is missing)."""
+    digests = [(skill, digest(ROOT / 'skills' / skill / 'scripts' / module)) for skill in skills]
+    canonical = digests[0][1]
+    if canonical is None:
+        return digests
+    return [(skill, value) for skill, value in digests[1:] if value != canonical]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check shared skill modules are identical copies')
+    parser.add_argument('--sync', action='store_true',
+                        help='Copy each canonical module over its other copies')
+    args = parser.parse_args()
+
+    failures = 0
+    for module, skills in SHARED_MODULES:
+        canonical = ROOT / 'skills' / skills[0] / 'scripts' / module
+        drifted = check(module, skills)
+        if drifted and args.sync and canonical.exists():
+            for skill, _ in drifted:
+                shutil.copy2(canonical, ROOT / 'skills' / skill / 'scripts' / module)
+                print(f"{module}: copied {skills[0]} -> {skill}")
+            drifted = check(module, skills)
+        if not drifted:
+            print(f"{module}: identical in {', '.join(skills)}")
+            continue
+        failures += 1
+        details = ', '.join(f"{skill} {value or 'missing'}" for skill, value in drifted)
+        print(f"{module}: DIFFERS from {skills[0]} ({digest(canonical) or 'missing'}): {details}")
+
+    if failures:
+        print(f"{failures} shared module(s) out of sync; edit the first copy and run --sync")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Startup-time budget check for the skill scripts.
+
+Runs each script entry point on a tiny fixture under `python -X importtime`
+and totals the import time of every module it loads beyond what a bare
+interpreter already loads. The median of several runs is compared with the
+script's budget; any script over budget fails the check (exit status 1).
+
+Each script gets one unmeasured warm-up run so bytecode is cached, as it is
+for users. Budgets are in milliseconds of import time on a typical laptop;
+pass --scale on slower machines rather than editing them.
+
+Usage:
+    python scripts/check_startup.py
+    python scripts/check_startup.py --runs 9 --scale 1.5 --verbose
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (script, arguments, import-time budget in ms); arguments refer to the fixture
+CASES = [
+    ('skills/eta/scripts/estimate_task.py', ['--task', 'Fix login bug', '--path', '.'], 50),
+    ('skills/pre-mortem/scripts/analyse_risk.py', ['--task', 'Fix login bug', '--path', '.'], 55),
+    ('skills/loose-ends/scripts/sweep.py', ['--engine', 'python'], 45),
+    ('skills/dont-be-greedy/scripts/estimate_size.py', ['data.csv'], 25),
+    ('skills/dont-be-greedy/scripts/quick_inspect.py', ['data.json'], 25),
+    ('skills/dont-be-greedy/scripts/quick_inspect.py', ['data.csv'], 25),
+    ('skills/dont-be-greedy/scripts/chunker.py', ['data.txt'], 30),
+    ('skills/dont-be-greedy/scripts/summarize.py', ['--source', 'data.txt'], 30),
+    ('skills/dont-be-greedy/scripts/csv_profile.py', ['data.csv'], 30),
+    ('skills/drip/scripts/estimate_water.py', ['--tokens', '50000'], 25),
+    ('skills/fan-out/scripts/run_tasks.py', ['tasks.json'], 40),
+    ('scripts/skill_client.py', ['estimate_water.py', '--tokens', '1'], 20),
+]
+
+
+def write_fixture(root: Path) -> None:
+    (root / 'app.py').write_text('import os\n\n# TODO: tidy\ndef main():\n    print(os.getcwd())\n')
+    (root / 'data.csv').write_text('id,name,score\n' + ''.join(f'{i},n{i},{i * 0.5}\n' for i in range(200)))
+    (root / 'data.json').write_text('[' + ','.join(f'{{"id": {i}}}' for i in range(200)) + ']')
+    (root / 'data.txt').write_text(''.join(f'line {i}\n' for i in range(500)))
+    (root / 'tasks.json').write_text('{"tasks": [{"id": "a", "run": "echo a"}, {"id": "b", "run": "echo b"}]}')
+
+
+def import_times(args: List[str], cwd: Path) -> Dict[str, int]:
+    """Top-level import name -> cumulative microseconds, for one run."""
+    env = dict(os.environ, SKILL_DAEMON_SOCKET=str(cwd / 'no-daemon.sock'))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # measure warm .pyc loads, as users see them
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=cwd, env=env,
+                            capture_output=True, text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented; their time is already in their parent's cumulative
+        if name.startswith(' ') and not name.startswith('  ') and cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(script: str, args: List[str], cwd: Path, baseline: Set[str],
+            runs: int) -> Tuple[float, List[Tuple[str, int]]]:
+    """Median total import ms over runs, plus the heaviest imports of the last run."""
+    import_times([str(ROOT / script)] + args, cwd)  # warm-up: writes __pycache__
+    totals = []
+    extra = {}
+    for _ in range(runs):
+        times = import_times([str(ROOT / script)] + args, cwd)
+        extra = {name: us for name, us in times.items() if name not in baseline}
+        totals.append(sum(extra.values()) / 1000)
+    return statistics.median(totals), sorted(extra.items(), key=lambda item: -item[1])[:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check skill script import times against budgets')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per script (median is used)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget by this')
+    parser.add_argument('--verbose', action='store_true', help='Show the heaviest imports per script')
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = Path(tmp)
+        write_fixture(cwd)
+        baseline = set(import_times(['-c', 'pass'], cwd))
+
+        print(f"{'script':<58} {'import ms':>9} {'budget':>7}")
+        for script, script_args, budget_ms in CASES:
+            median_ms, heaviest = measure(script, script_args, cwd, baseline, args.runs)
+            budget = budget_ms * args.scale
+            over = median_ms > budget
+            failures += over
+            label = f"{script} {' '.join(script_args)}"[:58]
+            print(f"{label:<58} {median_ms:9.1f} {budget:7.0f}{'  OVER' if over else ''}")
+            if args.verbose or over:
+                for name, us in heaviest:
+                    print(f"    {name:<30} {us / 1000:6.1f} ms")
+
+    if failures:
+        print(f"{failures} script(s) over budget")
+        return 1
+    print("All scripts within budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Run a skill script through skill_daemon.py, or directly if no daemon is up.
+
+Takes the script (a path, or a bare name such as estimate_task.py) followed
+by its usual arguments, so existing command lines only gain a prefix:
+
+    python scripts/skill_client.py skills/eta/scripts/estimate_task.py --task "Fix login"
+    python scripts/skill_client.py quick_inspect.py data.csv
+
+Kept to a handful of stdlib imports so the client itself starts fast.
+"""
+
+import json
+import os
+import socket
+import sys
+
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'skills')
+
+
+def socket_path() -> str:
+    """Socket location; must match skill_daemon.socket_path()."""
+    if os.environ.get('SKILL_DAEMON_SOCKET'):
+        return os.environ['SKILL_DAEMON_SOCKET']
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], f'skill-daemon-{os.getuid()}.sock')
+    return os.path.join('/tmp', f'skill-daemon-{os.getuid()}', 'skill-daemon.sock')
+
+
+def trusted(path: str) -> bool:
+    """True if the socket and its directory belong to this user and nobody else can enter the directory."""
+    try:
+        sock = os.lstat(path)
+        parent = os.lstat(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return False
+    uid = os.getuid()
+    return sock.st_uid == uid and parent.st_uid == uid and parent.st_mode & 0o777 == 0o700
+
+
+def resolve(script: str) -> str:
+    """Path of a script given as a path or as a bare file name under skills/*/scripts/."""
+    if os.sep in script or os.path.exists(script):
+        return os.path.realpath(script)
+    name = script if script.endswith('.py') else script + '.py'
+    for skill in sorted(os.listdir(SKILLS_DIR)):
+        candidate = os.path.join(SKILLS_DIR, skill, 'scripts', name)
+        if os.path.exists(candidate):
+            return os.path.realpath(candidate)
+    return script
+
+
+def call_daemon(path: str, argv: list):
+    """Run the script on the daemon, writing its stdout as it arrives; return the final reply.
+
+    Returns None if the daemon is not running, not ours, or does not serve
+    this script; that is always known before any output arrives.
+    """
+    sock_path = socket_path()
+    if not trusted(sock_path):
+        return None
+    request = {'script': os.path.splitext(os.path.basename(path))[0], 'path': path,
+               'argv': argv, 'cwd': os.getcwd()}
+    streamed = False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(sock_path)
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            with sock.makefile('rb') as f:
+                for line in f:
+                    reply = json.loads(line)
+                    if 'stdout' not in reply:
+                        break
+                    streamed = True
+                    sys.stdout.write(reply['stdout'])
+                    sys.stdout.flush()
+                else:
+                    reply = None
+    except BrokenPipeError:
+        if streamed:  # our reader went away (e.g. piped into head)
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return {'status': 1, 'stderr': ''}
+        reply = None
+    except (OSError, ValueError):
+        reply = None
+    if streamed and not reply:
+        # Too late to run the script directly: part of its output is already out
+        return {'status': 1, 'stderr': 'skill_client: lost the connection to the daemon\n'}
+    if not reply or reply.get('unknown'):
+        return None
+    return reply
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: skill_client.py <script> [args...]", file=sys.stderr)
+        return 2
+    path = resolve(sys.argv[1])
+    argv = sys.argv[2:]
+
+    reply = call_daemon(path, argv)
+    if reply is None:
+        os.execv(sys.executable, [sys.executable, path] + argv)
+
+    sys.stderr.write(reply['stderr'])
+    return reply['status']
+
+
+if __name__ == '__main__':
+    sys.exit(main())
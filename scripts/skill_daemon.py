@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Optional long-running server for the skill scripts.
+
+Each skill script is normally a fresh `python` process, paying interpreter
+startup and imports on every call. This daemon imports the scripts once and
+runs their main() in-process for requests arriving on a Unix socket, so
+compiled regexes and imported modules stay warm, and per-file caches
+(file_cache.py) stay open in memory between calls.
+
+Run it in the background and call scripts through skill_client.py, which
+takes the same arguments as the script itself and runs the script directly
+if no daemon is listening:
+
+    python scripts/skill_daemon.py serve &
+    python scripts/skill_client.py estimate_task.py --task "Fix login" --path .
+    python scripts/skill_daemon.py stop
+
+Requests are handled one at a time. A script whose source changes is
+reloaded on its next call; restart the daemon after changing shared modules.
+"""
+
+import argparse
+import contextlib
+import importlib
+import importlib.util
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SKILLS_DIR = Path(__file__).resolve().parent.parent / 'skills'
+
+# Script module -> skill that ships it
+SCRIPTS = {
+    'estimate_task': 'eta',
+    'analyse_risk': 'pre-mortem',
+    'sweep': 'loose-ends',
+    'scan_core': 'eta',
+    'quick_inspect': 'dont-be-greedy',
+    'estimate_size': 'dont-be-greedy',
+    'summarize': 'dont-be-greedy',
+    'chunker': 'dont-be-greedy',
+    'csv_profile': 'dont-be-greedy',
+    'estimate_water': 'drip',
+}
+
+# Exit after this long without a request, so a forgotten daemon does not linger
+IDLE_TIMEOUT_SECONDS = 30 * 60
+
+# Largest request accepted, in bytes (arguments only; files are read from disk)
+MAX_REQUEST_BYTES = 1 << 20
+
+# Characters of a script's stdout buffered before they are sent to the client
+STREAM_CHUNK_CHARS = 64 * 1024
+
+
+def socket_path() -> str:
+    """Socket location; skill_client.py computes the same path."""
+    if os.environ.get('SKILL_DAEMON_SOCKET'):
+        return os.environ['SKILL_DAEMON_SOCKET']
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], f'skill-daemon-{os.getuid()}.sock')
+    # /tmp is shared, so keep the socket in a directory only this user can enter
+    return os.path.join('/tmp', f'skill-daemon-{os.getuid()}', 'skill-daemon.sock')
+
+
+def private_dir(path: str) -> None:
+    """Create the socket's directory if needed; raise if other users could reach the socket.
+
+    skill_client.py only connects to a socket whose directory passes this check.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(directory, 0o700)
+    info = os.lstat(directory)
+    if info.st_uid != os.getuid() or info.st_mode & 0o777 != 0o700:
+        raise PermissionError(f"{directory} must be owned by this user with mode 0700")
+
+
+class StreamOutput(io.TextIOBase):
+    """A script's stdout, sent to the client as {"stdout": text} lines while it runs.
+
+    At most STREAM_CHUNK_CHARS are held at a time, so a script that streams
+    its output (analyse_risk --json) keeps its memory flat under the daemon.
+    """
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.parts = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= STREAM_CHUNK_CHARS:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self.parts:
+            text = ''.join(self.parts)
+            self.parts, self.size = [], 0
+            self.wfile.write(json.dumps({'stdout': text}).encode() + b'\n')
+
+
+class CapturedOutput(io.StringIO):
+    """A script's stderr; scripts may close it (e.g. on a broken pipe), which keeps the text."""
+
+    def close(self):
+        pass
+
+
+class ScriptHost:
+    """Imports skill scripts on first use and runs their main() with redirected I/O."""
+
+    def __init__(self):
+        for skill in sorted(set(SCRIPTS.values())):
+            scripts_dir = str(SKILLS_DIR / skill / 'scripts')
+            if scripts_dir not in sys.path:
+                sys.path.append(scripts_dir)
+        self.modules = {}
+        self.mtimes = {}
+
+    def load(self, name: str):
+        module = self.modules.get(name)
+        if module is None:
+            module = importlib.import_module(name)
+            self.modules[name] = module
+            file_cache = sys.modules.get('file_cache')
+            if file_cache is not None:
+                file_cache.FileCache.keep_open()
+        else:
+            mtime = os.stat(module.__file__).st_mtime_ns
+            if mtime != self.mtimes.get(name):
+                module = importlib.reload(module)
+                self.modules[name] = module
+        self.mtimes[name] = os.stat(module.__file__).st_mtime_ns
+        return module
+
+    def serves(self, name: str, path: str) -> bool:
+        """Whether name is a known script and path (if given) is the copy this daemon imports.
+
+        A module shipped in several skills (scan_core) is imported from the
+        first skill on sys.path; the copies are kept identical by
+        check_shared.py, so a path to any other copy is not served.
+        """
+        if name not in SCRIPTS:
+            return False
+        module = self.modules.get(name)
+        if module is not None:
+            expected = module.__file__
+        else:
+            spec = importlib.util.find_spec(name)
+            expected = spec.origin if spec else None
+        return not path or (expected is not None and os.path.realpath(path) == os.path.realpath(expected))
+
+    def run(self, name: str, argv: List[str], cwd: str, out: io.TextIOBase) -> Tuple[int, str]:
+        """Run one script with stdout going to out; returns (exit status, stderr)."""
+        err = CapturedOutput()
+        old_argv, old_cwd = sys.argv, os.getcwd()
+        status = 0
+        try:
+            os.chdir(cwd)
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    module = self.load(name)
+                    sys.argv = [module.__file__] + argv
+                    status = module.main()
+                except SystemExit as e:
+                    status = e.code
+                except Exception:
+                    traceback.print_exc()
+                    status = 1
+        finally:
+            sys.argv = old_argv
+            os.chdir(old_cwd)
+
+        if isinstance(status, str):
+            err.write(status + '\n')
+            status = 1
+        return int(status or 0), err.getvalue()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return
+        server = self.server
+        server.last_request = time.monotonic()
+
+        command = request.get('command', 'run')
+        if command == 'ping':
+            response = {'status': 0, 'pid': os.getpid(), 'scripts': sorted(server.host.modules)}
+        elif command == 'shutdown':
+            response = {'status': 0}
+            server.stopping = True
+        elif not server.host.serves(request.get('script', ''), request.get('path', '')):
+            response = {'status': 2, 'unknown': True}
+        else:
+            out = StreamOutput(self.wfile)
+            status, stderr = server.host.run(
+                request.get('script', ''), request.get('argv', []), request.get('cwd', '.'), out)
+            response = {'status': status, 'stderr': stderr}
+            try:
+                out.flush()
+            except OSError:
+                return  # client went away
+        with contextlib.suppress(OSError):
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class SkillServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str):
+        self.host = ScriptHost()
+        self.last_request = time.monotonic()
+        self.stopping = False
+        super().__init__(path, RequestHandler)
+
+    def service_actions(self):
+        if time.monotonic() - self.last_request > IDLE_TIMEOUT_SECONDS:
+            self.stopping = True
+
+
+def send(request: Dict, path: str) -> Dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+
+def serve(path: str) -> int:
+    try:
+        private_dir(path)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    try:
+        send({'command': 'ping'}, path)
+        print(f"Daemon already running on {path}", file=sys.stderr)
+        return 1
+    except OSError:
+        pass
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)  # stale socket from a daemon that died
+
+    old_umask = os.umask(0o177)  # socket is private to this user
+    try:
+        server = SkillServer(path)
+    finally:
+        os.umask(old_umask)
+
+    print(f"Serving skill scripts on {path}", file=sys.stderr)
+    try:
+        server.timeout = 1.0  # wake up regularly to check the idle timeout
+        while not server.stopping:
+            server.handle_request()
+            server.service_actions()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve skill scripts over a Unix socket')
+    parser.add_argument('command', choices=['serve', 'stop', 'status'])
+    parser.add_argument('--socket', default=socket_path(), help='Socket path')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        return serve(args.socket)
+
+    try:
+        reply = send({'command': 'ping' if args.command == 'status' else 'shutdown'}, args.socket)
+    except OSError:
+        print(f"No daemon on {args.socket}")
+        return 1
+    if args.command == 'status':
+        loaded = ', '.join(reply['scripts']) or 'none'
+        print(f"Daemon pid {reply['pid']} on {args.socket}; loaded: {loaded}")
+    else:
+        print("Daemon stopping")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,36 +1,209 @@
 #!/usr/bin/env python3
 """
 Simple line-based chunker for CSV / text data.
-Adjust to token-based splitting if you have a tokenizer available.
+
+The source file is memory-mapped once and split by newline scanning into
+lightweight chunk views (memoryview slices), so chunks can be consumed
+in-process without copying or intermediate files. Writing *.chunkN.txt files
+is opt-in (--write-chunks). Either way a sidecar index (<name>.chunks.jsonl)
+records each chunk's byte and line range so it can be re-read later with a
+seek via read_chunk().
+
+With --max-tokens, records are packed greedily up to a token budget instead of
+a fixed line count. Records are never split (a quoted CSV field may span
+lines), and CSV chunks after the first repeat the header row.
 """
 import sys
 import os
-from typing import List
+import json
+import mmap
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from estimate_size import approx_tokens
 
 MAX_LINES_PER_CHUNK = 2000
 
+class ChunkSpan(NamedTuple):
+    chunk_id: int
+    byte_start: int
+    byte_end: int    # exclusive
+    line_start: int  # 1-based, inclusive
+    line_end: int    # inclusive
+    header: bool = False  # chunk data is prefixed with the CSV header row
+
+class ChunkView(NamedTuple):
+    span: ChunkSpan
+    header: memoryview  # empty unless span.header
+    body: memoryview
+
+def chunk_text(view: ChunkView) -> str:
+    return str(view.header, "utf-8", "replace") + str(view.body, "utf-8", "replace")
+
+def _count_byte(mm: mmap.mmap, byte: bytes, start: int, end: int) -> int:
+    n = 0
+    i = mm.find(byte, start, end)
+    while i != -1:
+        n += 1
+        i = mm.find(byte, i + 1, end)
+    return n
+
+def _line_end(mm: mmap.mmap, pos: int, size: int) -> int:
+    end = mm.find(b"\n", pos)
+    return size if end == -1 else end + 1
+
+def iter_records(mm: mmap.mmap, is_csv: bool) -> Iterator[Tuple[int, int, int]]:
+    """Yield (start, end, lines) per record: a line, or for CSV, lines joined while a quote is open."""
+    pos, size = 0, len(mm)
+    while pos < size:
+        end = _line_end(mm, pos, size)
+        lines = 1
+        if is_csv:
+            quotes = _count_byte(mm, b'"', pos, end)
+            while quotes % 2 and end < size:
+                next_end = _line_end(mm, end, size)
+                quotes += _count_byte(mm, b'"', end, next_end)
+                end = next_end
+                lines += 1
+        yield pos, end, lines
+        pos = end
+
+def iter_spans(mm: mmap.mmap, is_csv: bool, max_lines: int = MAX_LINES_PER_CHUNK,
+               max_tokens: Optional[int] = None,
+               count_tokens: Optional[Callable[[str], int]] = None) -> Iterator[ChunkSpan]:
+    """Plan chunk boundaries over a mapped file without copying it.
+
+    Chunks hold max_lines records, or with max_tokens as many records as fit in
+    the budget (a single oversized record still gets its own chunk). Tokens are
+    counted with estimate_size.approx_tokens unless count_tokens is given.
+    """
+    counter = count_tokens or approx_tokens
+
+    def tokens_of(start: int, end: int) -> int:
+        return counter(mm[start:end].decode("utf-8", errors="replace"))
+
+    header_tokens = None
+    chunk_id = 1
+    chunk_start = 0
+    line_start = 1
+    line_no = 0
+    records = 0
+    chunk_tokens = 0
+    for start, end, lines in iter_records(mm, is_csv):
+        record_tokens = tokens_of(start, end) if max_tokens else 0
+        if header_tokens is None:
+            header_tokens = record_tokens if is_csv else 0
+        repeated_header_tokens = header_tokens if chunk_id > 1 else 0
+
+        if records and max_tokens and repeated_header_tokens + chunk_tokens + record_tokens > max_tokens:
+            yield ChunkSpan(chunk_id, chunk_start, start, line_start, line_no, is_csv and chunk_id > 1)
+            chunk_id += 1
+            chunk_start = start
+            line_start = line_no + 1
+            records = 0
+            chunk_tokens = 0
+
+        records += 1
+        chunk_tokens += record_tokens
+        line_no += lines
+
+        if not max_tokens and records == max_lines:
+            yield ChunkSpan(chunk_id, chunk_start, end, line_start, line_no, is_csv and chunk_id > 1)
+            chunk_id += 1
+            chunk_start = end
+            line_start = line_no + 1
+            records = 0
+    if records:
+        yield ChunkSpan(chunk_id, chunk_start, len(mm), line_start, line_no, is_csv and chunk_id > 1)
+
+def map_chunks(path: str, max_lines: int = MAX_LINES_PER_CHUNK, max_tokens: Optional[int] = None,
+               count_tokens: Optional[Callable[[str], int]] = None) -> Iterator[ChunkView]:
+    """Memory-map path once and yield a zero-copy view per chunk.
+
+    The mapping stays alive while any view references it, so views remain
+    valid after iteration finishes.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    is_csv = os.path.splitext(path)[1].lower() == ".csv"
+    data = memoryview(mm)
+    no_header = data[:0]
+    header = data[:next(iter_records(mm, True))[1]] if is_csv else no_header
+    for span in iter_spans(mm, is_csv, max_lines, max_tokens, count_tokens):
+        yield ChunkView(span, header if span.header else no_header, data[span.byte_start:span.byte_end])
+
+def iter_chunks(path: str, max_lines: int = MAX_LINES_PER_CHUNK, max_tokens: Optional[int] = None,
+                count_tokens: Optional[Callable[[str], int]] = None) -> Iterator[Tuple[ChunkSpan, bytes]]:
+    """Yield (span, raw bytes) for each chunk."""
+    for view in map_chunks(path, max_lines, max_tokens, count_tokens):
+        yield view.span, bytes(view.header) + bytes(view.body)
+
+def index_path_for(path: str, out_dir: str = ".") -> str:
+    return os.path.join(out_dir, f"{os.path.basename(path)}.chunks.jsonl")
+
+def write_index(path: str, max_lines: int = MAX_LINES_PER_CHUNK, out_dir: str = ".",
+                max_tokens: Optional[int] = None, write_chunks: bool = False) -> Iterator[str]:
+    """Write the sidecar index, and chunk files if asked, yielding each chunk file as it is written."""
+    base = os.path.basename(path)
+    with open(index_path_for(path, out_dir), "w", encoding="utf-8") as index:
+        for view in map_chunks(path, max_lines, max_tokens):
+            index.write(json.dumps(view.span._asdict()) + "\n")
+            if write_chunks:
+                out = os.path.join(out_dir, f"{base}.chunk{view.span.chunk_id}.txt")
+                with open(out, "wb") as f:
+                    f.write(view.header)
+                    f.write(view.body)
+                yield out
+
+def read_index(index_path: str) -> Iterator[ChunkSpan]:
+    with open(index_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield ChunkSpan(**json.loads(line))
+
+def read_chunk(path: str, span: ChunkSpan) -> str:
+    """Re-read one chunk straight from the source file using its byte offsets."""
+    with open(path, "rb") as f:
+        header = f.readline() if span.header else b""
+        while header.count(b'"') % 2:
+            line = f.readline()
+            if not line:
+                break
+            header += line
+        f.seek(span.byte_start)
+        data = f.read(span.byte_end - span.byte_start)
+    return (header + data).decode("utf-8", errors="replace")
+
 def chunk_lines(path: str, max_lines: int = MAX_LINES_PER_CHUNK) -> List[str]:
-    chunks = []
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        current = []
-        for i, line in enumerate(f, 1):
-            current.append(line)
-            if i % max_lines == 0:
-                chunks.append("".join(current))
-                current = []
-        if current:
-            chunks.append("".join(current))
-    return chunks
+    """All chunks as strings. Holds the whole file in memory; prefer map_chunks."""
+    return [chunk_text(view) for view in map_chunks(path, max_lines)]
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: chunker.py <path> [max_lines]")
-        sys.exit(2)
-    path = sys.argv[1]
-    max_lines = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_LINES_PER_CHUNK
-    chunks = chunk_lines(path, max_lines)
-    for idx, c in enumerate(chunks, 1):
-        out = f"{{os.path.basename(path)}}.chunk{{idx}}.txt"
-        with open(out, "w", encoding="utf-8") as f:
-            f.write(c)
+def pop_option(args: List[str], name: str) -> Optional[str]:
+    """Remove `name value` from args and return value (None if absent)."""
+    if name not in args:
+        return None
+    i = args.index(name)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+def main():
+    args = sys.argv[1:]
+    write_chunks = "--write-chunks" in args
+    if write_chunks:
+        args.remove("--write-chunks")
+    max_tokens = pop_option(args, "--max-tokens")
+    if not args:
+        print("Usage: chunker.py <path> [max_lines] [--max-tokens N] [--write-chunks]")
+        return 2
+    path = args[0]
+    max_lines = int(args[1]) if len(args) > 1 else MAX_LINES_PER_CHUNK
+    for out in write_index(path, max_lines, max_tokens=int(max_tokens) if max_tokens else None,
+                           write_chunks=write_chunks):
         print(out)
+    print(index_path_for(path))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Compact per-column profile of a CSV file, read in fixed-size blocks.
+
+For each column: inferred dtype, null count, min/max, approximate distinct
+count (HyperLogLog) and approximate quantiles (uniform sample). Uses pandas
+chunked reading when pandas/NumPy are installed, otherwise streams rows with
+the csv module. Memory is bounded by one block plus fixed-size sketches.
+
+Usage:
+    python csv_profile.py data.csv
+"""
+import sys
+import csv
+import json
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+BLOCK_ROWS = 50_000
+
+# Stop profiling after this long and report what was seen
+PROFILE_TIME_BUDGET_SECONDS = 30.0
+
+# HyperLogLog with 2**12 registers: ~1.6% standard error in 4 KB per column
+HLL_PRECISION = 12
+
+# Values kept per column for quantile estimates
+QUANTILE_SAMPLE_SIZE = 2048
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+NULL_TOKENS = {"", "na", "n/a", "nan", "null", "none", "-"}
+BOOL_TOKENS = {"true", "false", "yes", "no", "t", "f"}
+
+MASK64 = (1 << 64) - 1
+
+
+def hll_estimate(registers) -> int:
+    """Cardinality estimate from HyperLogLog registers (with small-range correction)."""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / sum(2.0 ** -int(r) for r in registers)
+    zeros = sum(1 for r in registers if r == 0)
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * math.log(m / zeros)
+    return int(round(estimate))
+
+
+def _quantiles(sample: List[float]) -> Dict[str, float]:
+    if not sample:
+        return {}
+    ordered = sorted(sample)
+    last = len(ordered) - 1
+    return {f"p{int(q * 100)}": ordered[int(round(q * last))] for q in QUANTILES}
+
+
+def _number(text: str) -> Optional[float]:
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+class ColumnStats:
+    """Streaming statistics for one column (pure-Python path)."""
+
+    def __init__(self, name: str, rng: random.Random):
+        self.name = name
+        self.rng = rng
+        self.count = 0
+        self.nulls = 0
+        self.is_int = self.is_float = self.is_bool = True
+        self.num_min = self.num_max = None
+        self.str_min = self.str_max = None
+        self.registers = bytearray(1 << HLL_PRECISION)
+        self.sample: List[float] = []
+        self.numeric_seen = 0
+
+    def add(self, raw: str) -> None:
+        self.count += 1
+        value = raw.strip()
+        if value.lower() in NULL_TOKENS:
+            self.nulls += 1
+            return
+
+        h = hash(value) & MASK64
+        idx = h >> (64 - HLL_PRECISION)
+        rest = (h << HLL_PRECISION) & MASK64
+        rank = min(64 - rest.bit_length() + 1, 64 - HLL_PRECISION + 1)
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+        if self.str_min is None or value < self.str_min:
+            self.str_min = value
+        if self.str_max is None or value > self.str_max:
+            self.str_max = value
+        if self.is_bool and value.lower() not in BOOL_TOKENS:
+            self.is_bool = False
+
+        if self.is_float:
+            number = _number(value)
+            if number is None:
+                self.is_float = self.is_int = False
+                return
+            if self.is_int and not number.is_integer():
+                self.is_int = False
+            if self.num_min is None or number < self.num_min:
+                self.num_min = number
+            if self.num_max is None or number > self.num_max:
+                self.num_max = number
+            # Reservoir sampling keeps a uniform sample of every number seen
+            self.numeric_seen += 1
+            if len(self.sample) < QUANTILE_SAMPLE_SIZE:
+                self.sample.append(number)
+            else:
+                slot = self.rng.randrange(self.numeric_seen)
+                if slot < QUANTILE_SAMPLE_SIZE:
+                    self.sample[slot] = number
+
+    def result(self) -> Dict[str, Any]:
+        return _column_result(
+            self.name, self.count, self.nulls, self.is_int, self.is_float, self.is_bool,
+            self.num_min, self.num_max, self.str_min, self.str_max, self.registers, self.sample)
+
+
+def _column_result(name, count, nulls, is_int, is_float, is_bool, num_min, num_max,
+                   str_min, str_max, registers, sample) -> Dict[str, Any]:
+    present = count - nulls
+    if present == 0:
+        dtype = "empty"
+    elif is_int:
+        dtype = "int"
+    elif is_float:
+        dtype = "float"
+    elif is_bool:
+        dtype = "bool"
+    else:
+        dtype = "string"
+
+    result = {"name": name, "dtype": dtype, "nulls": nulls}
+    if dtype in ("int", "float"):
+        cast = int if dtype == "int" else float
+        result["min"], result["max"] = cast(num_min), cast(num_max)
+        result["quantiles"] = {k: cast(v) for k, v in _quantiles(sample).items()}
+    elif present:
+        result["min"], result["max"] = str_min[:50], str_max[:50]
+    result["distinct_approx"] = min(hll_estimate(registers), present)
+    return result
+
+
+def _profile_with_csv(path: str, deadline: float) -> Dict[str, Any]:
+    rng = random.Random(0)
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {"rows": 0, "columns": []}
+        columns = [ColumnStats(name, rng) for name in header]
+        rows = 0
+        truncated = False
+        for row in reader:
+            rows += 1
+            for stats, value in zip(columns, row):
+                stats.add(value)
+            for stats in columns[len(row):]:
+                stats.add("")  # short row: missing fields are nulls
+            if rows % BLOCK_ROWS == 0 and time.monotonic() > deadline:
+                truncated = True
+                break
+    result = {"rows": rows, "columns": [c.result() for c in columns]}
+    if truncated:
+        result["truncated"] = True
+    return result
+
+
+def _profile_with_pandas(path: str, deadline: float, pd, np) -> Dict[str, Any]:
+    reader = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=BLOCK_ROWS,
+                         encoding_errors="replace")
+    rng = np.random.default_rng(0)
+    state: Dict[str, Dict[str, Any]] = {}
+    order: List[str] = []
+    rows = 0
+    truncated = False
+    m = 1 << HLL_PRECISION
+
+    for frame in reader:
+        rows += len(frame)
+        for name in frame.columns:
+            st = state.get(name)
+            if st is None:
+                st = state[name] = {
+                    "count": 0, "nulls": 0, "is_int": True, "is_float": True, "is_bool": True,
+                    "num_min": None, "num_max": None, "str_min": None, "str_max": None,
+                    "registers": np.zeros(m, dtype=np.uint8),
+                    "sample": np.empty(0), "keys": np.empty(0),
+                }
+                order.append(name)
+
+            values = frame[name].str.strip()
+            null = values.str.lower().isin(NULL_TOKENS)
+            present = values[~null]
+            st["count"] += len(values)
+            st["nulls"] += int(null.sum())
+            if present.empty:
+                continue
+
+            hashes = pd.util.hash_pandas_object(present, index=False).to_numpy(dtype=np.uint64)
+            idx = (hashes >> np.uint64(64 - HLL_PRECISION)).astype(np.int64)
+            rest = (hashes << np.uint64(HLL_PRECISION)).astype(np.float64)
+            # Leading zeros via the float exponent (exact enough for a sketch)
+            bits = np.where(rest > 0, np.floor(np.log2(np.maximum(rest, 1.0))) + 1, 0)
+            rank = np.minimum(64 - bits + 1, 64 - HLL_PRECISION + 1).astype(np.uint8)
+            np.maximum.at(st["registers"], idx, rank)
+
+            lo, hi = present.min(), present.max()
+            st["str_min"] = lo if st["str_min"] is None else min(st["str_min"], lo)
+            st["str_max"] = hi if st["str_max"] is None else max(st["str_max"], hi)
+            if st["is_bool"] and not present.str.lower().isin(BOOL_TOKENS).all():
+                st["is_bool"] = False
+
+            if st["is_float"]:
+                numbers = pd.to_numeric(present, errors="coerce").to_numpy(dtype=np.float64)
+                if np.isnan(numbers).any() or not np.isfinite(numbers).all():
+                    st["is_float"] = st["is_int"] = False
+                    continue
+                if st["is_int"] and not (numbers == np.floor(numbers)).all():
+                    st["is_int"] = False
+                lo, hi = float(numbers.min()), float(numbers.max())
+                st["num_min"] = lo if st["num_min"] is None else min(st["num_min"], lo)
+                st["num_max"] = hi if st["num_max"] is None else max(st["num_max"], hi)
+                # Keep the values with the smallest random keys: a uniform sample
+                keys = np.concatenate([st["keys"], rng.random(len(numbers))])
+                sample = np.concatenate([st["sample"], numbers])
+                if len(keys) > QUANTILE_SAMPLE_SIZE:
+                    keep = np.argpartition(keys, QUANTILE_SAMPLE_SIZE)[:QUANTILE_SAMPLE_SIZE]
+                    keys, sample = keys[keep], sample[keep]
+                st["keys"], st["sample"] = keys, sample
+
+        if time.monotonic() > deadline:
+            truncated = True
+            break
+
+    columns = [
+        _column_result(name, st["count"], st["nulls"], st["is_int"], st["is_float"], st["is_bool"],
+                       st["num_min"], st["num_max"], st["str_min"], st["str_max"],
+                       st["registers"].tolist(), st["sample"].tolist())
+        for name, st in ((name, state[name]) for name in order)
+    ]
+    result = {"rows": rows, "columns": columns}
+    if truncated:
+        result["truncated"] = True
+    return result
+
+
+def profile_csv(path: str, budget: float = PROFILE_TIME_BUDGET_SECONDS,
+                use_pandas: bool = True) -> Dict[str, Any]:
+    """Profile every column of a CSV file."""
+    deadline = time.monotonic() + budget
+    if use_pandas:
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            pass
+        else:
+            result = _profile_with_pandas(path, deadline, pd, np)
+            result["engine"] = "pandas"
+            return result
+    result = _profile_with_csv(path, deadline)
+    result["engine"] = "csv"
+    return result
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: csv_profile.py <path>")
+        return 2
+    print(json.dumps(profile_csv(sys.argv[1]), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,197 @@
 """
 Estimate token cost for a file using conservative heuristics.
 This is heuristic-only; adapt to your tokenizer/LLM.
+
+Rather than dividing the byte count by a constant, a few sample windows are
+read at evenly spaced offsets (one seek each, so cost does not grow with file
+size). Each window is measured for chars-per-token and the share of non-text
+bytes, and the per-window rates are extrapolated to the whole file with a 95%
+confidence interval. .gz/.bz2/.xz files are sampled through the decompressor.
 """
+import math
 import os
+import re
 import sys
-from typing import Tuple
+from typing import List, NamedTuple, Tuple
 
 AVERAGE_CHARS_PER_TOKEN = 4  # conservative heuristic
 
+SAMPLE_WINDOWS = 8
+SAMPLE_WINDOW_BYTES = 4096
+
+# Decompressed bytes sampled from the head of a compressed file
+COMPRESSED_SAMPLE_BYTES = SAMPLE_WINDOWS * SAMPLE_WINDOW_BYTES
+
+# Compressed bytes of a .gz decoded past the sample, to find whether the first
+# member ends early (multi-member gzip; bgzip members are under 64 KiB) and to
+# count small files exactly
+MEMBER_PROBE_BYTES = 1 << 20
+
+# Share of non-text bytes above which a file is treated as binary
+BINARY_THRESHOLD = 0.30
+
+# Rough BPE behaviour: a word costs about one token per 6 letters, digits go
+# in groups of up to 3, and punctuation / non-ASCII characters cost one each.
+TOKEN_RE = re.compile(r"[A-Za-z]+|\d{1,3}|\S")
+LETTERS_PER_TOKEN = 6
+
+# Bytes other than \t \n \r \f below 0x20, plus DEL
+NON_TEXT_BYTES = bytes(set(range(32)) - {9, 10, 12, 13} | {127})
+
+class SizeEstimate(NamedTuple):
+    size_bytes: int            # on disk
+    content_bytes: int         # decompressed size (see content_estimated)
+    tokens: int
+    tokens_low: int
+    tokens_high: int
+    chars_per_token: float
+    non_text_ratio: float
+    binary: bool
+    compression: str           # '', 'gz', 'bz2' or 'xz'
+    content_estimated: bool = False  # content_bytes extrapolated rather than known
+
+# Words long enough to cost more than one token
+LONG_WORD_RE = re.compile(r"[A-Za-z]{%d,}" % (LETTERS_PER_TOKEN + 1))
+
+def approx_tokens(text: str) -> int:
+    # One token per TOKEN_RE match, plus the extra tokens of long words; counted
+    # with findall rather than a per-match loop, as chunker.py runs this on every record
+    return len(TOKEN_RE.findall(text)) + sum(
+        (len(word) - 1) // LETTERS_PER_TOKEN for word in LONG_WORD_RE.findall(text))
+
+def _measure(sample: bytes) -> Tuple[float, float, float]:
+    """Return (tokens per byte, chars per token, non-text ratio) for one window."""
+    if not sample:
+        return 0.0, float(AVERAGE_CHARS_PER_TOKEN), 0.0
+    non_text = len(sample) - len(sample.translate(None, NON_TEXT_BYTES))
+    text = sample.decode("utf-8", errors="replace")
+    non_text += text.count("�")
+    tokens = max(1, approx_tokens(text))
+    return tokens / len(sample), len(text) / tokens, min(1.0, non_text / len(sample))
+
+def _read_windows(path: str, size: int) -> List[bytes]:
+    with open(path, "rb") as f:
+        if size <= SAMPLE_WINDOWS * SAMPLE_WINDOW_BYTES:
+            return [f.read()]
+        stride = (size - SAMPLE_WINDOW_BYTES) // (SAMPLE_WINDOWS - 1)
+        windows = []
+        for i in range(SAMPLE_WINDOWS):
+            f.seek(i * stride)
+            windows.append(f.read(SAMPLE_WINDOW_BYTES))
+        return windows
+
+def _compression_of(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return {".gz": "gz", ".bz2": "bz2", ".xz": "xz"}.get(ext, "")
+
+def _read_compressed_head(path: str, compression: str, size: int) -> Tuple[List[bytes], int, bool]:
+    """Decompress the head of a file; return (sample windows, content bytes, whether that is estimated)."""
+    if compression == "gz":
+        import functools
+        import zlib
+        new_decompressor = functools.partial(zlib.decompressobj, wbits=31)
+    elif compression == "bz2":
+        import bz2
+        new_decompressor = bz2.BZ2Decompressor
+    else:
+        import lzma
+        new_decompressor = lzma.LZMADecompressor
+
+    decompressor = new_decompressor()
+    out = []
+    produced = consumed = 0
+    multi_member = False
+    with open(path, "rb") as f:
+        block = b""
+        while produced < COMPRESSED_SAMPLE_BYTES or (
+                compression == "gz" and consumed < MEMBER_PROBE_BYTES):
+            if not block:
+                block = f.read(SAMPLE_WINDOW_BYTES)
+                if not block:
+                    break
+                consumed += len(block)
+            try:
+                data = decompressor.decompress(block)
+            except (OSError, EOFError, ValueError):
+                break
+            if produced < COMPRESSED_SAMPLE_BYTES:
+                out.append(data)
+            produced += len(data)
+            block = b""
+            if getattr(decompressor, "eof", False):
+                # Concatenated members/streams (multi-member gzip, bgzip, pbzip2):
+                # carry on into the next one with what is left of this block
+                block = decompressor.unused_data
+                if not block and f.tell() >= size:
+                    break
+                decompressor = new_decompressor()
+                multi_member = True
+        # Compressed bytes actually decoded, not counting any left over in block
+        used = consumed - len(block)
+        finished = getattr(decompressor, "eof", False) and used >= size
+        # Extrapolated from the compression ratio of everything decoded so far
+        extrapolated = int(size * produced / used) if used else 0
+
+        if finished:
+            content, estimated = produced, False
+        elif compression == "gz" and not multi_member and size >= 4:
+            # gzip stores the uncompressed size mod 2**32 in its last 4 bytes; take
+            # the multiple of 2**32 closest to the extrapolated size (certain only
+            # while that is well below 4 GiB). That is the last member's size, so
+            # it only holds when the first member did not end within the probe.
+            f.seek(size - 4)
+            trailer = int.from_bytes(f.read(4), "little")
+            wraps = max(0, round((extrapolated - trailer) / (1 << 32)))
+            content = trailer + wraps * (1 << 32)
+            if content < produced:
+                content += 1 << 32
+            estimated = max(content, extrapolated) >= 1 << 31
+        else:
+            content, estimated = max(produced, extrapolated), True
+
+    head = b"".join(out)[:COMPRESSED_SAMPLE_BYTES]
+    windows = [head[i:i + SAMPLE_WINDOW_BYTES] for i in range(0, len(head), SAMPLE_WINDOW_BYTES)]
+    return windows or [b""], content, estimated
+
+def sample_estimate(path: str) -> SizeEstimate:
+    """Estimate tokens from strided samples, with a 95% confidence interval."""
+    size = os.path.getsize(path)
+    compression = _compression_of(path)
+    if compression:
+        windows, content_bytes, content_estimated = _read_compressed_head(path, compression, size)
+    else:
+        windows, content_bytes, content_estimated = _read_windows(path, size), size, False
+
+    measures = [_measure(w) for w in windows if w] or [_measure(b"")]
+    rates = [m[0] for m in measures]
+    mean = sum(rates) / len(rates)
+    if len(rates) > 1 and len(windows[0]) < content_bytes:
+        variance = sum((r - mean) ** 2 for r in rates) / (len(rates) - 1)
+        margin = 1.96 * math.sqrt(variance / len(rates))
+    else:
+        margin = 0.0
+
+    non_text = sum(m[2] for m in measures) / len(measures)
+    return SizeEstimate(
+        size_bytes=size,
+        content_bytes=content_bytes,
+        tokens=max(1, int(content_bytes * mean)),
+        tokens_low=max(1, int(content_bytes * max(0.0, mean - margin))),
+        tokens_high=max(1, int(content_bytes * (mean + margin))),
+        chars_per_token=sum(m[1] for m in measures) / len(measures),
+        non_text_ratio=non_text,
+        binary=non_text > BINARY_THRESHOLD,
+        compression=compression,
+        content_estimated=content_estimated,
+    )
+
 def estimate_tokens_for_file(path: str) -> Tuple[int, int]:
     """Return (bytes, estimated_tokens)."""
     size_bytes = os.path.getsize(path)
-    # read small sample to estimate char distribution for text files
-    est_chars = size_bytes
-    est_tokens = max(1, int(est_chars / AVERAGE_CHARS_PER_TOKEN))
+    try:
+        est_tokens = sample_estimate(path).tokens
+    except OSError:
+        est_tokens = max(1, int(size_bytes / AVERAGE_CHARS_PER_TOKEN))
     return size_bytes, est_tokens
 
 def human_bytes(n: int) -> str:
@@ -24,10 +202,23 @@ def human_bytes(n: int) -> str:
         n /= 1024
     return f"{n:.1f}TB"
 
-if __name__ == "__main__":
+def main():
     if len(sys.argv) < 2:
         print("Usage: estimate_size.py <path>")
-        sys.exit(2)
+        return 2
     path = sys.argv[1]
-    bytes_, tokens = estimate_tokens_for_file(path)
-    print(f"bytes={{bytes_}} ({{human_bytes(bytes_)}}) tokens={{tokens}}")
+    est = sample_estimate(path)
+    line = (f"bytes={est.size_bytes} ({human_bytes(est.size_bytes)}) tokens={est.tokens} "
+            f"range={est.tokens_low}-{est.tokens_high} chars_per_token={est.chars_per_token:.1f} "
+            f"non_text={est.non_text_ratio:.2f}")
+    if est.compression:
+        approx = "~" if est.content_estimated else ""
+        line += (f" {est.compression}_content_bytes={approx}{est.content_bytes}"
+                 f" ({approx}{human_bytes(est.content_bytes)})")
+    if est.binary:
+        line += " binary=yes"
+    print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
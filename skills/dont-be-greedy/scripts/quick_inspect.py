@@ -2,60 +2,240 @@
 """
 Quick inspection for small data files.
 Returns basic stats: file type, row/line count, column info for structured data.
+
+Everything is streamed in fixed-size blocks, so memory stays bounded on any
+file: lines are counted on raw bytes, and JSON is scanned incrementally for
+its top-level structure, item count and first keys without being parsed into
+objects. Each inspection stops at TIME_BUDGET_SECONDS; counts are then
+extrapolated from the bytes read and marked "estimated".
 """
 import sys
 import os
 import json
-from typing import Dict, Any
+import re
+import time
+from typing import Dict, Any, List
+
+BLOCK_SIZE = 1 << 20
+
+# Hard cap on time spent reading any one file
+TIME_BUDGET_SECONDS = 2.0
+
+MAX_KEYS = 20
+MAX_KEY_BYTES = 200
+
+# Longest line kept by _read_head_lines; the rest of a longer line is skipped
+MAX_LINE_CHARS = 64 * 1024
+
+def _read_head_lines(path: str, n: int) -> List[str]:
+    """First n lines, each cut at MAX_LINE_CHARS without reading the rest into memory."""
+    lines = []
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        while len(lines) < n:
+            line = f.readline(MAX_LINE_CHARS)
+            if not line:
+                break
+            tail = line
+            while tail and not tail.endswith("\n"):
+                tail = f.readline(MAX_LINE_CHARS)  # skip the rest of an over-long line
+            lines.append(line.rstrip("\r\n"))
+    return lines
+
+def count_lines(path: str, budget: float = TIME_BUDGET_SECONDS) -> Dict[str, Any]:
+    """Count lines in raw byte blocks; extrapolate if the time budget runs out."""
+    size = os.path.getsize(path)
+    deadline = time.monotonic() + budget
+    lines = 0
+    read = 0
+    last = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            read += len(block)
+            last = block[-1:]
+            if time.monotonic() > deadline and read < size:
+                return {"lines": int(lines * size / read), "estimated": True}
+    if last and last != b"\n":
+        lines += 1  # final line without a trailing newline
+    return {"lines": lines}
 
 def inspect_csv(path: str) -> Dict[str, Any]:
     """Inspect CSV file and return basic stats."""
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        lines = f.readlines()
-    if not lines:
+    import csv
+    import io
+
+    head = _read_head_lines(path, 6)
+    if not head:
         return {"type": "csv", "rows": 0, "columns": [], "empty": True}
-    header = lines[0].strip().split(",")
-    return {
+    header = next(csv.reader(io.StringIO(head[0])), [])
+    counted = count_lines(path)
+    result = {
         "type": "csv",
-        "rows": len(lines) - 1,
+        "rows": counted["lines"] - 1,
         "columns": len(header),
         "column_names": header[:20],  # first 20 columns
-        "preview_rows": [l.strip()[:200] for l in lines[1:6]],  # first 5 data rows
+        "preview_rows": [l.strip()[:200] for l in head[1:6]],  # first 5 data rows
     }
+    if counted.get("estimated"):
+        result["estimated"] = True
+    return result
 
-def inspect_json(path: str) -> Dict[str, Any]:
-    """Inspect JSON file and return structure info."""
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        data = json.load(f)
-    result = {"type": "json"}
-    if isinstance(data, list):
+# Complete strings and structural characters; everything else (numbers,
+# literals, whitespace) is skipped in bulk by the regex engine. A lone quote
+# marks a string that continues into the next block.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{},:]|"', re.S)
+_STRING_BODY = re.compile(rb'(?:[^"\\]|\\.)*', re.S)
+
+def _decode_key(raw: bytes) -> str:
+    try:
+        return json.loads(b'"' + raw + b'"')
+    except ValueError:
+        return raw.decode("utf-8", errors="replace")
+
+def scan_json(path: str, budget: float = TIME_BUDGET_SECONDS) -> Dict[str, Any]:
+    """Report top-level structure, item count and first keys of a JSON document.
+
+    Keys come from the top-level object, or from the first element of a
+    top-level array. Only small fragments (candidate keys) are ever held.
+    """
+    deadline = time.monotonic() + budget
+    size = os.path.getsize(path)
+    result: Dict[str, Any] = {"type": "json"}
+
+    stack = []           # open containers: '{' or '['
+    top = None           # '{' or '[' once seen
+    separators = 0       # commas at depth 1
+    has_content = False  # anything inside the top-level container
+    keys: List[str] = []
+    in_string = False    # inside a string that crossed a block boundary
+    string_buf = None    # bytes of that string, if it may be a key
+    last_string = None   # raw bytes of the previous string, if it may be a key
+    first_element_done = False
+    read = 0
+    carry = b""
+
+    def collect_keys_here() -> bool:
+        if len(keys) >= MAX_KEYS:
+            return False
+        depth = len(stack)
+        if top == "{":
+            return depth == 1
+        return depth == 2 and stack[1] == "{" and not first_element_done
+
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            read += len(block)
+            buf = carry + block
+            carry = b""
+            pos = 0
+            end = len(buf)
+            while pos < end:
+                if in_string:
+                    m = _STRING_BODY.match(buf, pos)
+                    stop = m.end()
+                    if string_buf is not None and len(string_buf) < MAX_KEY_BYTES:
+                        string_buf += buf[pos:stop]
+                    if stop < end and buf[stop:stop + 1] == b'"':
+                        in_string = False
+                        last_string = string_buf
+                        string_buf = None
+                        pos = stop + 1
+                    else:
+                        carry = buf[stop:]  # a lone trailing backslash
+                        pos = end
+                    continue
+
+                for m in _TOKEN.finditer(buf, pos):
+                    if not has_content and len(stack) == 1 and buf[pos:m.start()].strip():
+                        has_content = True  # a scalar before this token
+                    pos = m.end()
+                    tok = m.group()
+                    ch = tok[:1]
+
+                    if ch == b'"':
+                        if len(stack) >= 1:
+                            has_content = True
+                        collect = collect_keys_here()
+                        if len(tok) == 1:
+                            in_string = True
+                            string_buf = b"" if collect else None
+                            break
+                        last_string = tok[1:-1][:MAX_KEY_BYTES] if collect else None
+                    elif ch == b"{" or ch == b"[":
+                        if top is None:
+                            top = ch.decode()
+                        elif stack:
+                            has_content = True
+                        stack.append(ch.decode())
+                    elif ch == b"}" or ch == b"]":
+                        if stack:
+                            stack.pop()
+                        if top == "[" and len(stack) == 1:
+                            first_element_done = True
+                    elif ch == b",":
+                        if len(stack) == 1:
+                            separators += 1
+                            first_element_done = True
+                    else:  # ':'
+                        if last_string is not None and collect_keys_here():
+                            keys.append(_decode_key(last_string))
+                        last_string = None
+                else:
+                    if not has_content and len(stack) == 1 and buf[pos:end].strip():
+                        has_content = True
+                    pos = end
+
+            if time.monotonic() > deadline and read < size:
+                result["estimated"] = True
+                separators = int(separators * size / read)
+                break
+
+    count = separators + 1 if has_content else 0
+    if top == "[":
         result["structure"] = "array"
-        result["items"] = len(data)
-        if data and isinstance(data[0], dict):
-            result["keys"] = list(data[0].keys())[:20]
-    elif isinstance(data, dict):
+        result["items"] = count
+        if keys:
+            result["keys"] = keys
+    elif top == "{":
         result["structure"] = "object"
-        result["keys"] = list(data.keys())[:20]
+        result["keys"] = keys
+        result["key_count"] = count
     return result
 
+def inspect_json(path: str) -> Dict[str, Any]:
+    """Inspect JSON file and return structure info."""
+    return scan_json(path)
+
 def inspect_text(path: str) -> Dict[str, Any]:
     """Inspect plain text/log file."""
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        lines = f.readlines()
-    return {
+    result = {
         "type": "text",
-        "lines": len(lines),
-        "preview": [l.strip()[:200] for l in lines[:10]],
+        "lines": 0,
+        "preview": [l.strip()[:200] for l in _read_head_lines(path, 10)],
     }
+    result.update(count_lines(path))
+    return result
+
+def quick_inspect(path: str, profile: bool = False) -> Dict[str, Any]:
+    """Auto-detect file type and run appropriate inspection.
 
-def quick_inspect(path: str) -> Dict[str, Any]:
-    """Auto-detect file type and run appropriate inspection."""
+    With profile, CSV files also get per-column statistics (csv_profile.py).
+    """
     ext = os.path.splitext(path)[1].lower()
     size_bytes = os.path.getsize(path)
     result = {"path": path, "size_bytes": size_bytes}
     try:
         if ext == ".csv":
             result.update(inspect_csv(path))
+            if profile:
+                from csv_profile import profile_csv
+                result["profile"] = profile_csv(path)
         elif ext == ".json":
             result.update(inspect_json(path))
         else:
@@ -64,10 +244,18 @@ def quick_inspect(path: str) -> Dict[str, Any]:
         result["error"] = str(e)
     return result
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: quick_inspect.py <path>")
-        sys.exit(2)
-    path = sys.argv[1]
-    result = quick_inspect(path)
+def main():
+    args = sys.argv[1:]
+    profile = "--profile" in args
+    if profile:
+        args.remove("--profile")
+    if not args:
+        print("Usage: quick_inspect.py <path> [--profile]")
+        return 2
+    path = args[0]
+    result = quick_inspect(path, profile=profile)
     print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
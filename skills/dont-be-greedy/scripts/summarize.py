@@ -2,22 +2,136 @@
 """
 Very small local summariser used as a placeholder.
 In production, call the configured LLM or a concise heuristic.
+
+Summarise one chunk file, or a whole source file in-process with --source
+(chunks are memory-mapped views; no chunk files are written).
+
+With --workers N, chunks are summarised concurrently (map) and the chunk
+summaries are combined in groups into one file-level summary (reduce), the
+same shape the map-reduce skill describes. Workers re-read their chunk by
+byte offset, so only (path, span) pairs cross process boundaries, and at most
+a few chunks per worker are in flight at once.
 """
 import sys
 import os
-import csv
-from typing import List
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from chunker import (MAX_LINES_PER_CHUNK, ChunkSpan, chunk_text, map_chunks, pop_option,
+                     read_chunk, read_index)
+
+# Chunks queued per worker; bounds memory while keeping every worker busy
+PENDING_PER_WORKER = 4
+
+# Summaries combined per reduce step; 6500 chunks reduce in 4 levels
+REDUCE_FAN_IN = 10
 
 def summarize_text(text: str, max_sentences: int = 3) -> str:
     # naive: return first N non-empty lines as a 'summary'
     lines = [l.strip() for l in text.splitlines() if l.strip()]
     return " ".join(lines[:max_sentences])
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: summarize.py <chunk_file>")
-        sys.exit(2)
-    path = sys.argv[1]
+def summarize_source(path: str, max_lines: int = MAX_LINES_PER_CHUNK,
+                     max_tokens: Optional[int] = None, max_sentences: int = 3) -> Iterator[str]:
+    """Yield one summary line per chunk of path, without intermediate files."""
+    for view in map_chunks(path, max_lines, max_tokens):
+        span = view.span
+        summary = summarize_text(chunk_text(view), max_sentences=max_sentences)
+        yield f"chunk {span.chunk_id} (lines {span.line_start}-{span.line_end}): {summary}"
+
+def _map_chunk(path: str, span: ChunkSpan) -> Tuple[ChunkSpan, str]:
+    return span, summarize_text(read_chunk(path, span))
+
+def _reduce_group(summaries: List[str]) -> str:
+    # Cap at the longest input so each reduce level stays the same size
+    limit = max(len(summary) for summary in summaries)
+    return summarize_text("\n".join(summaries))[:limit]
+
+def _map_all(pool: "Executor", path: str, spans: Iterator[ChunkSpan], workers: int) -> Dict[int, Tuple[ChunkSpan, str]]:
+    """Summarise every span with at most PENDING_PER_WORKER chunks queued per worker."""
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    results = {}
+    pending = set()
+    for span in spans:
+        if len(pending) >= workers * PENDING_PER_WORKER:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                span_done, summary = future.result()
+                results[span_done.chunk_id] = (span_done, summary)
+        pending.add(pool.submit(_map_chunk, path, span))
+    for future in wait(pending).done:
+        span_done, summary = future.result()
+        results[span_done.chunk_id] = (span_done, summary)
+    return results
+
+def map_reduce(path: str, index_path: Optional[str] = None, workers: int = 4,
+               max_lines: int = MAX_LINES_PER_CHUNK, max_tokens: Optional[int] = None,
+               threads: bool = False) -> Tuple[List[Tuple[ChunkSpan, str]], str, float]:
+    """Summarise all chunks of path concurrently, then reduce to one summary.
+
+    Chunk boundaries come from index_path (a .chunks.jsonl sidecar) or are
+    planned on the fly. Use threads=True when summarising means waiting on an
+    LLM rather than computing locally. Returns (per-chunk summaries in chunk
+    order, overall summary, chunks/sec).
+    """
+    if index_path:
+        spans = read_index(index_path)
+    else:
+        spans = (view.span for view in map_chunks(path, max_lines, max_tokens))
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    pool_class = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    start = time.perf_counter()
+    with pool_class(max_workers=workers) as pool:
+        results = _map_all(pool, path, spans, workers)
+        chunk_summaries = [results[chunk_id] for chunk_id in sorted(results)]
+        elapsed = time.perf_counter() - start
+
+        level = [summary for _, summary in chunk_summaries]
+        while len(level) > 1:
+            groups = [level[i:i + REDUCE_FAN_IN] for i in range(0, len(level), REDUCE_FAN_IN)]
+            level = list(pool.map(_reduce_group, groups))
+
+    throughput = len(chunk_summaries) / elapsed if elapsed > 0 else 0.0
+    return chunk_summaries, (level[0] if level else ""), throughput
+
+def main():
+    args = sys.argv[1:]
+    threads = "--threads" in args
+    if threads:
+        args.remove("--threads")
+    source = pop_option(args, "--source")
+    index_path = pop_option(args, "--index")
+    max_tokens = pop_option(args, "--max-tokens")
+    workers = pop_option(args, "--workers")
+    max_tokens = int(max_tokens) if max_tokens else None
+
+    if source and (workers or index_path):
+        workers = int(workers or 0) or os.cpu_count() or 1
+        chunk_summaries, overall, throughput = map_reduce(
+            source, index_path, workers, max_tokens=max_tokens, threads=threads)
+        for span, summary in chunk_summaries:
+            print(f"chunk {span.chunk_id} (lines {span.line_start}-{span.line_end}): {summary}")
+        print()
+        print(f"Overall: {overall}")
+        print(f"{len(chunk_summaries)} chunks, {throughput:.1f} chunks/sec with {workers} workers",
+              file=sys.stderr)
+        return 0
+    if source:
+        for line in summarize_source(source, max_tokens=max_tokens):
+            print(line)
+        return 0
+    if not args:
+        print("Usage: summarize.py <chunk_file> | --source <path> [--max-tokens N] "
+              "[--workers N] [--index <chunks.jsonl>] [--threads]")
+        return 2
+    path = args[0]
     with open(path, "r", encoding="utf-8", errors="replace") as f:
         text = f.read()
     print(summarize_text(text, max_sentences=3))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,11 @@ Based on:
 Usage:
     python estimate_water.py --tokens 50000
     python estimate_water.py --words 10000
+    python estimate_water.py --transcripts ~/.claude/projects
 """
 
 import argparse
+import os
 
 # Mid-range estimate including indirect water (electricity generation)
 # Conservative: excludes hardware manufacturing, lifecycle analysis
@@ -33,6 +35,19 @@ COMPARISONS = [
     (65000, "5-minute shower"),
 ]
 
+# Per-file read offsets and usage totals, so reruns only read appended lines
+DEFAULT_CHECKPOINT = os.path.join('~', '.claude', 'cache', 'drip-transcripts.json')
+
+# Bump when the checkpoint layout changes; older checkpoints are discarded
+CHECKPOINT_VERSION = 1
+
+# Usage fields summed per assistant message: input, output, cache write, cache read
+USAGE_FIELDS = ('input_tokens', 'output_tokens',
+                'cache_creation_input_tokens', 'cache_read_input_tokens')
+
+# Sessions listed in the transcript report (largest first)
+TOP_SESSIONS = 10
+
 
 def tokens_to_ml(tokens: int) -> float:
     """Convert token count to estimated water in ml."""
@@ -52,6 +67,166 @@ def get_comparison(ml: float) -> str:
     return f"{ml/1000:.1f} liters"
 
 
+def processed_tokens(counts: list) -> int:
+    """Input + output tokens (USAGE_FIELDS order), counting cache writes as input.
+
+    Cache reads are reported but not counted: they reuse an earlier
+    computation rather than processing the tokens again.
+    """
+    input_tokens, output_tokens, cache_write, _ = counts
+    return input_tokens + output_tokens + cache_write
+
+
+def find_transcripts(paths: list) -> list:
+    """JSONL files among paths, with directories searched recursively."""
+    found = []
+    for path in paths:
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.endswith('.jsonl'))
+        elif os.path.isfile(path):
+            found.append(path)
+    return [os.path.abspath(path) for path in found]
+
+
+def read_usage(path: str, record: dict) -> dict:
+    """Add the usage in path beyond record['offset'] to record['rows'].
+
+    Lines are read one at a time from the saved offset, and only lines
+    mentioning "usage" are parsed. A message written as several lines
+    (one per content block) repeats its id and usage, so it is counted
+    once. A trailing line without a newline is still being written and is
+    left for the next run. A file that was replaced or truncated is
+    re-read from the start.
+    """
+    import json
+
+    st = os.stat(path)
+    if record.get('inode') != st.st_ino or st.st_size < record.get('offset', 0):
+        record = {'inode': st.st_ino, 'offset': 0, 'last_id': None, 'rows': {}}
+    if st.st_size == record['offset']:
+        return record
+
+    default_session = os.path.splitext(os.path.basename(path))[0]
+    rows, offset, last_id = record['rows'], record['offset'], record['last_id']
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            if b'"usage"' not in line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            message = entry.get('message') if isinstance(entry, dict) else None
+            usage = message.get('usage') if isinstance(message, dict) else None
+            if not isinstance(usage, dict):
+                continue
+            message_id = message.get('id')
+            if message_id and message_id == last_id:
+                continue
+            try:
+                counts = [int(usage.get(field) or 0) for field in USAGE_FIELDS]
+            except (TypeError, ValueError):
+                continue
+            last_id = message_id
+            if not any(counts):
+                continue
+            key = '\t'.join((str(entry.get('sessionId') or default_session),
+                             str(entry.get('timestamp') or '')[:10] or 'unknown',
+                             str(message.get('model') or 'unknown')))
+            row = rows.setdefault(key, [0] * len(USAGE_FIELDS))
+            for i, count in enumerate(counts):
+                row[i] += count
+    record.update(offset=offset, last_id=last_id)
+    return record
+
+
+def load_checkpoint(path: str) -> dict:
+    import json
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != CHECKPOINT_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_checkpoint(path: str, files: dict) -> None:
+    import json
+
+    path = os.path.abspath(path)  # a bare file name has no directory to create
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CHECKPOINT_VERSION, 'files': files}, f, separators=(',', ':'))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # unwritable cache dir: the next run reads everything again
+
+
+def aggregate_transcripts(paths: list, checkpoint: str = None) -> dict:
+    """Token totals by session, day and model across transcript files.
+
+    Returns {'files': n, 'read_bytes': n, 'session': {...}, 'day': {...},
+    'model': {...}}, each grouping mapping a key to a per-field token list
+    (USAGE_FIELDS order). With a checkpoint file, only bytes appended since
+    the last run are read.
+    """
+    files = load_checkpoint(checkpoint) if checkpoint else {}
+    totals = {'files': 0, 'read_bytes': 0, 'session': {}, 'day': {}, 'model': {}}
+    for path in find_transcripts(paths):
+        saved = files.get(path, {})
+        previous = saved.get('offset', 0)
+        try:
+            record = read_usage(path, saved)
+        except OSError:
+            continue
+        files[path] = record
+        totals['files'] += 1
+        totals['read_bytes'] += record['offset'] - (previous if record is saved else 0)
+        for key, counts in record['rows'].items():
+            for grouping, value in zip(('session', 'day', 'model'), key.split('\t')):
+                row = totals[grouping].setdefault(value, [0] * len(USAGE_FIELDS))
+                for i, count in enumerate(counts):
+                    row[i] += count
+    if checkpoint:
+        save_checkpoint(checkpoint, files)
+    return totals
+
+
+def format_transcripts(totals: dict, top_sessions: int = TOP_SESSIONS) -> str:
+    """Per-model, per-day and per-session tokens and water."""
+    lines = [f"Transcripts: {totals['files']} files ({totals['read_bytes']:,} bytes read)"]
+    header = f"  {'':<38} {'input':>12} {'output':>12} {'cache read':>14} {'water':>10}"
+    for grouping, title in (('model', 'By model'), ('day', 'By day'), ('session', 'By session')):
+        rows = totals[grouping]
+        if grouping == 'day':
+            ordered = sorted(rows.items())
+        else:
+            ordered = sorted(rows.items(), key=lambda item: -processed_tokens(item[1]))
+        if grouping == 'session' and len(ordered) > top_sessions:
+            title += f" (top {top_sessions} of {len(ordered)})"
+            ordered = ordered[:top_sessions]
+        lines += ["", f"{title}:", header]
+        for key, counts in ordered:
+            input_tokens, output_tokens, cache_write, cache_read = counts
+            lines.append(f"  {key[:38]:<38} {input_tokens + cache_write:>12,} {output_tokens:>12,} "
+                         f"{cache_read:>14,} {tokens_to_ml(processed_tokens(counts)):>8.1f}ml")
+    lines.append("")
+    return '\n'.join(lines)
+
+
 def format_output(tokens: int, ml: float) -> str:
     """Format the output with context."""
     lines = []
@@ -74,17 +249,31 @@ def main():
     )
     parser.add_argument('--tokens', type=int, help='Number of tokens')
     parser.add_argument('--words', type=int, help='Number of words (converted to tokens)')
+    parser.add_argument('--transcripts', nargs='+', metavar='PATH',
+                        help='JSONL session transcripts, or directories of them, to total')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT,
+                        help='Offsets file so reruns only read appended lines')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help='Read every transcript from the start')
 
     args = parser.parse_args()
 
-    if args.words:
+    if args.transcripts:
+        checkpoint = None if args.no_checkpoint else os.path.expanduser(args.checkpoint)
+        totals = aggregate_transcripts(args.transcripts, checkpoint)
+        if not totals['files']:
+            print(f"No transcripts found in: {' '.join(args.transcripts)}")
+            return
+        print(format_transcripts(totals))
+        tokens = sum(processed_tokens(counts) for counts in totals['model'].values())
+    elif args.words:
         tokens = words_to_tokens(args.words)
         print(f"({args.words} words ≈ {tokens} tokens)")
         print()
     elif args.tokens:
         tokens = args.tokens
     else:
-        print("Usage: estimate_water.py --tokens N or --words N")
+        print("Usage: estimate_water.py --tokens N, --words N or --transcripts PATH")
         return
 
     ml = tokens_to_ml(tokens)
@@ -5,15 +5,19 @@ Estimate Claude Code task completion time based on scope analysis.
 Usage:
     python estimate_task.py --task "Add user authentication" --path ./src
     python estimate_task.py --task "Fix login bug" --path . --files "auth.py,login.py"
+    python estimate_task.py --task "Fix login bug" --path . --changed-since main
 """
 
 import argparse
 import os
-import re
 import sys
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from scan_core import SKIP_DIRS, SKIPPED, LineCounter, MarkerCounter, Visitor, iter_scan
+
+# How analyse_scope walks the tree when no file list is given (also used by scan_core --all)
+WALK_OPTIONS = {'skip_dirs': SKIP_DIRS}
 
 # Claude Code performance baselines (measured values)
 BASELINES = {
@@ -53,18 +57,17 @@ WARNING_KEYWORDS = {
 }
 
 
-@dataclass
-class ScopeAnalysis:
+class ScopeAnalysis(NamedTuple):
     total_files: int
     total_lines: int
     test_files: int
     complexity_markers: int  # TODO, FIXME, HACK count
     languages: list
     largest_file_lines: int
+    skipped_files: tuple = ()  # (path, reason, size in bytes): binary or over the size limit
 
 
-@dataclass
-class TaskEstimate:
+class TaskEstimate(NamedTuple):
     category: str
     base_minutes: float
     scope_adjustment: float
@@ -77,51 +80,87 @@ class TaskEstimate:
     breakdown: dict
 
 
-def analyse_scope(path: str, extensions: list = None) -> ScopeAnalysis:
-    """Analyse codebase scope for estimation."""
-    if extensions is None:
-        extensions = ['.py', '.js', '.ts', '.tsx', '.jsx', '.go', '.rs', '.rb', '.java']
+DEFAULT_EXTENSIONS = ['.py', '.js', '.ts', '.tsx', '.jsx', '.go', '.rs', '.rb', '.java']
+
+# Files larger than this are skipped (and listed) rather than counted; such
+# files are almost always generated bundles or vendored data, not code to edit
+DEFAULT_MAX_FILE_MB = 10
 
-    path = Path(path)
-    if not path.exists():
-        return ScopeAnalysis(0, 0, 0, 0, [], 0)
 
+def scope_visitors(extensions: list = None) -> List[Visitor]:
+    """The scan_core visitors analyse_scope needs: line and TODO-marker counts."""
+    extensions = extensions or DEFAULT_EXTENSIONS
+    return [LineCounter(extensions), MarkerCounter(extensions)]
+
+
+def git_files(path: Path, changed_since: Optional[str] = None) -> Optional[List[Path]]:
+    """List files under path from git instead of walking the tree.
+
+    Without changed_since this is the index plus untracked files that are not
+    ignored. With changed_since it is only files that differ from that ref
+    (including untracked ones). Returns None if path is not in a git repo
+    (or git is not installed); raises RuntimeError with git's message if git
+    fails inside a repo, e.g. on an unknown ref.
+    """
+    import subprocess
+
+    if changed_since:
+        commands = [
+            ['git', 'diff', '--name-only', '--relative', '--diff-filter=d', '-z', changed_since, '--'],
+            ['git', 'ls-files', '-z', '--others', '--exclude-standard'],
+        ]
+    else:
+        commands = [['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard']]
+
+    names = set()
+    for cmd in commands:
+        try:
+            result = subprocess.run(cmd, cwd=path, capture_output=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            inside = subprocess.run(['git', 'rev-parse', '--git-dir'], cwd=path, capture_output=True)
+            if inside.returncode != 0:
+                return None
+            error = result.stderr.decode('utf-8', errors='replace').strip()
+            raise RuntimeError(error or f"{' '.join(cmd[:2])} exited with status {result.returncode}")
+        names.update(n for n in result.stdout.decode('utf-8', errors='surrogateescape').split('\0') if n)
+
+    return [path / name for name in sorted(names)]
+
+
+def scope_from_results(results: Iterable[Tuple[str, Dict[str, Any]]]) -> ScopeAnalysis:
+    """Aggregate scan_core line/marker results into a ScopeAnalysis."""
     total_files = 0
     total_lines = 0
     test_files = 0
     complexity_markers = 0
     languages = set()
     largest_file_lines = 0
+    skipped_files = []
 
-    skip_dirs = {'node_modules', 'venv', '.venv', '__pycache__', '.git', 'dist', 'build'}
-
-    for ext in extensions:
-        for file_path in path.rglob(f'*{ext}'):
-            # Skip excluded directories
-            if any(skip in file_path.parts for skip in skip_dirs):
-                continue
+    for file_path, result in results:
+        if SKIPPED in result:
+            reason, size = result[SKIPPED]
+            skipped_files.append((file_path, reason, size))
+        if LineCounter.name not in result:
+            continue
+        lines = result[LineCounter.name]
+        name = os.path.basename(file_path).lower()
 
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                lines = content.count('\n') + 1
+        total_files += 1
+        total_lines += lines
+        languages.add(os.path.splitext(name)[1])
 
-                total_files += 1
-                total_lines += lines
-                languages.add(ext)
+        if lines > largest_file_lines:
+            largest_file_lines = lines
 
-                if lines > largest_file_lines:
-                    largest_file_lines = lines
+        # Check for test files
+        if 'test' in name or 'spec' in name:
+            test_files += 1
 
-                # Check for test files
-                name = file_path.name.lower()
-                if 'test' in name or 'spec' in name:
-                    test_files += 1
-
-                # Count complexity markers
-                complexity_markers += len(re.findall(r'\b(TODO|FIXME|HACK|XXX)\b', content))
-
-            except Exception:
-                continue
+        # Count complexity markers
+        complexity_markers += result.get(MarkerCounter.name, 0)
 
     return ScopeAnalysis(
         total_files=total_files,
@@ -129,10 +168,40 @@ def analyse_scope(path: str, extensions: list = None) -> ScopeAnalysis:
         test_files=test_files,
         complexity_markers=complexity_markers,
         languages=list(languages),
-        largest_file_lines=largest_file_lines
+        largest_file_lines=largest_file_lines,
+        skipped_files=tuple(skipped_files)
     )
 
 
+def analyse_scope(path: str, extensions: list = None, use_cache: bool = True,
+                  use_git: bool = False, changed_since: Optional[str] = None,
+                  max_file_size: Optional[int] = DEFAULT_MAX_FILE_MB * 1024 * 1024) -> ScopeAnalysis:
+    """Analyse codebase scope for estimation.
+
+    Files are read in fixed-size blocks and counted as raw bytes, so memory
+    per file is bounded and nothing is decoded. Binary files and files over
+    max_file_size bytes (None for no limit) are listed in skipped_files
+    instead of being counted.
+
+    Per-file stats are cached under .claude/cache/, so files unchanged since
+    the last run are not reread. With use_git the file list comes from the git
+    index (respecting .gitignore); with changed_since only files changed since
+    that ref are analysed. Both fall back to walking the tree outside git; a
+    git failure inside a repo (e.g. an unknown ref) raises RuntimeError.
+    """
+    path = Path(path)
+    if not path.exists():
+        return ScopeAnalysis(0, 0, 0, 0, [], 0)
+
+    files = git_files(path, changed_since) if use_git or changed_since else None
+    if files is not None:
+        files = [f for f in files if not SKIP_DIRS.intersection(f.relative_to(path).parts)]
+
+    results = iter_scan(str(path), scope_visitors(extensions), files=files, use_cache=use_cache,
+                        max_file_size=max_file_size, **WALK_OPTIONS)
+    return scope_from_results(results)
+
+
 def categorise_task(task_description: str) -> str:
     """Categorise task based on description keywords."""
     task_lower = task_description.lower()
@@ -255,6 +324,12 @@ def format_output(task: str, scope: ScopeAnalysis, estimate: TaskEstimate) -> st
     lines.append(f"  Test files: {scope.test_files}")
     if scope.complexity_markers > 0:
         lines.append(f"  Tech debt markers: {scope.complexity_markers}")
+    if scope.skipped_files:
+        lines.append(f"  Skipped (not counted): {len(scope.skipped_files)}")
+        for file_path, reason, size in scope.skipped_files[:5]:
+            lines.append(f"    {file_path} ({reason}, {size / (1024 * 1024):.1f} MB)")
+        if len(scope.skipped_files) > 5:
+            lines.append(f"    ... and {len(scope.skipped_files) - 5} more")
     lines.append("")
 
     lines.append(f"Expected iterations: {estimate.iterations_low}-{estimate.iterations_high}")
@@ -307,11 +382,25 @@ def main():
     parser.add_argument('--path', default='.', help='Codebase path to analyse')
     parser.add_argument('--files', type=int, help='Override: number of files in scope')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Reread every file instead of using .claude/cache/')
+    parser.add_argument('--git', action='store_true',
+                        help='List files from the git index instead of walking the tree')
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='Only analyse files changed since a git ref (implies --git)')
+    parser.add_argument('--max-file-size', type=float, default=DEFAULT_MAX_FILE_MB, metavar='MB',
+                        help=f'Skip (and list) files larger than this (default: {DEFAULT_MAX_FILE_MB}; 0 = no limit)')
 
     args = parser.parse_args()
 
     # Analyse scope
-    scope = analyse_scope(args.path)
+    max_file_size = int(args.max_file_size * 1024 * 1024) if args.max_file_size > 0 else None
+    try:
+        scope = analyse_scope(args.path, use_cache=not args.no_cache, use_git=args.git,
+                              changed_since=args.changed_since, max_file_size=max_file_size)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
 
     # Generate estimate
     estimate = estimate_task(
@@ -339,6 +428,8 @@ def main():
                 'total_files': scope.total_files,
                 'total_lines': scope.total_lines,
                 'test_files': scope.test_files,
+                'skipped_files': [{'path': str(p), 'reason': reason, 'size': size}
+                                  for p, reason, size in scope.skipped_files],
             }
         }
         print(json.dumps(output, indent=2))
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Local parallel executor for the fan-out, map-reduce and pipeline skills.
+
+Runs the work items of a JSON task spec as subprocesses on a bounded
+worker pool, with a timeout and retries per task, and streams one JSON
+line per task as it finishes. Tasks may depend on others ("after"), which
+makes the spec a DAG of stages; an optional reduce step combines the
+results at the end.
+
+Copied into the map-reduce and pipeline skills as well; edit this (fan-out)
+copy and run scripts/check_shared.py --sync.
+
+Spec (JSON, from a file or '-' for stdin):
+
+    {
+      "workers": 4, "timeout": 120, "retries": 1,
+      "tasks": [
+        {"id": "lint", "run": "ruff check src"},
+        {"id": "count", "run": "wc -l < {item}", "glob": "src/**/*.py"},
+        {"id": "audit", "python": "scripts/audit.py", "args": ["--path", "src"]},
+        {"id": "report", "run": "sort | uniq -c", "after": ["lint", "audit"]}
+      ],
+      "reduce": "sum"
+    }
+
+- "run" is a shell command (string) or an argv list; "python" runs a script
+  with this interpreter, with "args" as its arguments.
+- "items" (a list) or "glob" turns one task into one task per item, with
+  {item} substituted (shell-quoted in shell commands). Expanded ids are
+  "<id>[<n>]"; "after" may name the unexpanded id to wait for all of them.
+- A task with "after" starts once those tasks succeed, and receives their
+  stdout, concatenated in order, on stdin. If one fails, it is skipped.
+- "timeout" (seconds) and "retries" may be set per task or for the spec
+  (--timeout/--retries override both); a timed-out task is killed together
+  with its child processes. "glob" is resolved relative to the task's "cwd".
+- "reduce" is "concat" (task stdout joined in spec order), "sum" (sum of
+  the first number in each task's stdout) or a task spec whose stdin is
+  the results as JSONL.
+
+Usage:
+    python run_tasks.py spec.json
+    python run_tasks.py spec.json --workers 8 --timeout 30
+    echo '{"tasks": [...]}' | python run_tasks.py -
+
+Output is JSONL: one record per task, then the reduce record (id
+"reduce"), then a summary comparing wall time with the summed task time.
+Exit status is 0 if every task succeeded, 1 otherwise, 2 for a bad spec.
+"""
+
+import argparse
+import glob
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_TIMEOUT = 600
+DEFAULT_RETRIES = 0
+
+# Characters of stderr kept per task record
+STDERR_TAIL_CHARS = 2000
+
+REDUCERS = ('concat', 'sum')
+
+
+class SpecError(ValueError):
+    """The task spec is malformed (wrong type, unknown dependency, cycle, missing command)."""
+
+
+def expand_tasks(spec: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Tasks with items/glob expanded and defaults filled in, in spec order.
+
+    overrides (e.g. a timeout from the command line) replace the spec's and
+    every task's own settings.
+    """
+    if not isinstance(spec, dict):
+        raise SpecError("spec must be a JSON object")
+    if not isinstance(spec.get('tasks', []), list):
+        raise SpecError("tasks must be a list")
+    workers = spec.get('workers')
+    if workers is not None and (not is_number(workers, int) or workers < 1):
+        raise SpecError(f"workers must be a positive integer, not {workers!r}")
+    tasks, groups = [], {}
+    for n, task in enumerate(spec.get('tasks', [])):
+        if not isinstance(task, dict) or not ('run' in task or 'python' in task):
+            raise SpecError(f"task {n}: needs 'run' or 'python'")
+        task_id = str(task.get('id', n))
+        if task_id in groups:
+            raise SpecError(f"duplicate task id: {task_id}")
+        cwd = task.get('cwd', spec.get('cwd'))
+        items = task.get('items')
+        if 'glob' in task:
+            items = expand_glob(task['glob'], cwd)
+        if items is not None and not isinstance(items, list):
+            raise SpecError(f"{task_id}: items must be a list")
+        if not isinstance(task.get('after', []), list):
+            raise SpecError(f"{task_id}: after must be a list of task ids")
+        base = {
+            'timeout': task.get('timeout', spec.get('timeout', DEFAULT_TIMEOUT)),
+            'retries': task.get('retries', spec.get('retries', DEFAULT_RETRIES)),
+            'cwd': cwd,
+            'after': [str(dep) for dep in task.get('after', [])],
+        }
+        base.update(overrides or {})
+        if not is_number(base['timeout'], (int, float)) or base['timeout'] <= 0:
+            raise SpecError(f"{task_id}: timeout must be a positive number of seconds, not {base['timeout']!r}")
+        if not is_number(base['retries'], int) or base['retries'] < 0:
+            raise SpecError(f"{task_id}: retries must be a non-negative integer, not {base['retries']!r}")
+        if items is None:
+            groups[task_id] = [task_id]
+            tasks.append(dict(base, id=task_id, argv=command(task), shell=isinstance(task.get('run'), str)))
+            continue
+        groups[task_id] = []
+        for i, item in enumerate(items):
+            item_id = f"{task_id}[{i}]"
+            groups[task_id].append(item_id)
+            tasks.append(dict(base, id=item_id, item=item, argv=command(task, str(item)),
+                              shell=isinstance(task.get('run'), str)))
+
+    # "after" may name a whole expanded group
+    for task in tasks:
+        after = []
+        for dep in task['after']:
+            if dep not in groups:
+                raise SpecError(f"{task['id']}: unknown dependency {dep}")
+            after.extend(groups[dep])
+        task['after'] = after
+    check_acyclic(tasks)
+    return tasks
+
+
+def is_number(value, types) -> bool:
+    """isinstance check that does not let JSON true/false pass as 1/0."""
+    return isinstance(value, types) and not isinstance(value, bool)
+
+
+def expand_glob(pattern: str, cwd: Optional[str]) -> List[str]:
+    """Paths matching pattern, resolved (and returned) relative to the task's cwd."""
+    if not cwd or os.path.isabs(pattern):
+        return sorted(glob.glob(pattern, recursive=True))
+    return sorted(os.path.relpath(path, cwd)
+                  for path in glob.glob(os.path.join(cwd, pattern), recursive=True))
+
+
+def command(task: Dict[str, Any], item: Optional[str] = None):
+    """Shell string or argv list for a task, with {item} substituted."""
+    if 'python' in task:
+        argv = [sys.executable, task['python']] + [str(arg) for arg in task.get('args', [])]
+        return argv if item is None else [arg.replace('{item}', item) for arg in argv]
+    run = task['run']
+    if isinstance(run, str):
+        return run if item is None else run.replace('{item}', shlex.quote(item))
+    return [str(arg) if item is None else str(arg).replace('{item}', item) for arg in run]
+
+
+def check_acyclic(tasks: List[Dict[str, Any]]) -> None:
+    after = {task['id']: task['after'] for task in tasks}
+    state = {}  # id -> 1 while visiting, 2 when done
+
+    for root in after:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(after[root]))]
+        while stack:
+            node, deps = stack[-1]
+            dep = next(deps, None)
+            if dep is None:
+                state[node] = 2
+                stack.pop()
+            elif state.get(dep) == 1:
+                raise SpecError(f"dependency cycle through {dep}")
+            elif dep not in state:
+                state[dep] = 1
+                stack.append((dep, iter(after[dep])))
+
+
+def run_once(argv, shell: bool, stdin: str, timeout: float, cwd: Optional[str]) -> Dict[str, Any]:
+    """One attempt; on timeout the whole process group is killed."""
+    try:
+        proc = subprocess.Popen(argv, shell=shell, cwd=cwd, text=True, errors='replace',
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, start_new_session=True)
+    except OSError as e:
+        return {'status': 'failed', 'returncode': None, 'stdout': '', 'stderr': str(e)}
+    try:
+        stdout, stderr = proc.communicate(stdin, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if hasattr(os, 'killpg'):
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        else:
+            proc.kill()
+        stdout, stderr = proc.communicate()
+        return {'status': 'timeout', 'returncode': proc.returncode, 'stdout': stdout, 'stderr': stderr}
+    status = 'ok' if proc.returncode == 0 else 'failed'
+    return {'status': status, 'returncode': proc.returncode, 'stdout': stdout, 'stderr': stderr}
+
+
+def run_task(task: Dict[str, Any], stdin: str = '') -> Dict[str, Any]:
+    """Run a task, retrying failures and timeouts; returns its result record."""
+    start = time.perf_counter()
+    for attempt in range(1, task['retries'] + 2):
+        result = run_once(task['argv'], task['shell'], stdin, task['timeout'], task['cwd'])
+        if result['status'] == 'ok':
+            break
+    record = {'id': task['id'], 'status': result['status'], 'returncode': result['returncode'],
+              'attempts': attempt, 'seconds': round(time.perf_counter() - start, 3),
+              'stdout': result['stdout'], 'stderr': result['stderr'][-STDERR_TAIL_CHARS:]}
+    if 'item' in task:
+        record['item'] = task['item']
+    return record
+
+
+def run_tasks(tasks: List[Dict[str, Any]], workers: int = DEFAULT_WORKERS, emit=None) -> Dict[str, Dict]:
+    """Run tasks in dependency order on a pool; emit(record) as each finishes.
+
+    Returns the records by task id. Tasks whose dependencies did not all
+    succeed are recorded as skipped without running.
+    """
+    records = {}
+    waiting = {task['id']: task for task in tasks}
+    running = {}
+
+    def finish(record):
+        records[record['id']] = record
+        if emit:
+            emit(record)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while waiting or running:
+            for task_id, task in list(waiting.items()):
+                if not all(dep in records for dep in task['after']):
+                    continue
+                del waiting[task_id]
+                if any(records[dep]['status'] != 'ok' for dep in task['after']):
+                    failed = [dep for dep in task['after'] if records[dep]['status'] != 'ok']
+                    finish({'id': task_id, 'status': 'skipped', 'returncode': None, 'attempts': 0,
+                            'seconds': 0.0, 'stdout': '', 'stderr': f"dependency failed: {', '.join(failed)}"})
+                    continue
+                stdin = ''.join(records[dep]['stdout'] for dep in task['after'])
+                running[pool.submit(run_task, task, stdin)] = task_id
+            if not running:
+                continue  # only skips happened this round; rescan the waiting tasks
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                finish(future.result())
+    return records
+
+
+def first_number(text: str) -> float:
+    for token in text.split():
+        try:
+            return float(token)
+        except ValueError:
+            continue
+    return 0.0
+
+
+def reduce_task(reducer, spec: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None):
+    """A builtin reducer's name, or the reduce step expanded as a task."""
+    if isinstance(reducer, str):
+        if reducer not in REDUCERS:
+            raise SpecError(f"unknown reducer {reducer!r} (use {', '.join(REDUCERS)} or a task)")
+        return reducer
+    if not isinstance(reducer, dict):
+        raise SpecError("reduce must be a reducer name or a task")
+    return expand_tasks({**spec, 'tasks': [dict(reducer, id='reduce', after=[])]}, overrides)[0]
+
+
+def reduce_results(reducer, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The reduce record for the task records, in spec order.
+
+    Builtin reducers use the successful records only; a reduce task gets
+    every record on stdin.
+    """
+    ok = [record for record in records if record['status'] == 'ok']
+    if reducer == 'concat':
+        return {'id': 'reduce', 'status': 'ok', 'stdout': ''.join(record['stdout'] for record in ok)}
+    if reducer == 'sum':
+        total = sum(first_number(record['stdout']) for record in ok)
+        return {'id': 'reduce', 'status': 'ok', 'value': int(total) if total.is_integer() else total}
+    stdin = ''.join(json.dumps(record) + '\n' for record in records)
+    return run_task(reducer, stdin)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a task spec on a local worker pool')
+    parser.add_argument('spec', help="JSON task spec file, or '-' for stdin")
+    parser.add_argument('--workers', type=int, help=f'Pool size (default: spec, else {DEFAULT_WORKERS})')
+    parser.add_argument('--timeout', type=float,
+                        help='Seconds per attempt for every task, overriding the spec')
+    parser.add_argument('--retries', type=int,
+                        help='Extra attempts after a failure for every task, overriding the spec')
+    args = parser.parse_args()
+
+    try:
+        if args.spec == '-':
+            spec = json.load(sys.stdin)
+        else:
+            with open(args.spec, encoding='utf-8') as f:
+                spec = json.load(f)
+        overrides = {key: value for key, value in (('timeout', args.timeout), ('retries', args.retries))
+                     if value is not None}
+        tasks = expand_tasks(spec, overrides)
+        reducer = reduce_task(spec['reduce'], spec, overrides) if spec.get('reduce') else None
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    def emit(record):
+        sys.stdout.write(json.dumps(record) + '\n')
+        sys.stdout.flush()
+
+    workers = args.workers or spec.get('workers') or DEFAULT_WORKERS
+    start = time.perf_counter()
+    records = run_tasks(tasks, workers, emit)
+    ordered = [records[task['id']] for task in tasks]
+    if reducer:
+        reduced = reduce_results(reducer, ordered)
+        emit(reduced)
+        ordered.append(reduced)
+
+    wall = time.perf_counter() - start
+    task_seconds = sum(record.get('seconds', 0.0) for record in ordered)
+    counts = {}
+    for record in ordered:
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+    emit({'summary': {'tasks': len(ordered), **counts, 'workers': workers,
+                      'wall_seconds': round(wall, 3), 'task_seconds': round(task_seconds, 3),
+                      'speedup': round(task_seconds / wall, 2) if wall else None}})
+    return 0 if all(record['status'] == 'ok' for record in ordered) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,75 +2,331 @@
 """
 Sweep script for loose-ends skill.
 Scans codebase for common cruft that should be cleaned up before declaring done.
+
+All patterns are searched in a single `rg --json` run; each match is
+classified into its category in-process, and ripgrep is stopped as soon as
+every category has hit its cap. Without ripgrep, a built-in scanner walks the
+tree once (honouring .gitignore, skipping hidden and binary files) and
+searches files in parallel with one combined regex per language.
+
+With --diff BASE, only lines added since BASE are searched, read from a
+streamed `git diff -U0`, so cost follows the size of the change rather than
+the size of the repo.
 """
 
-import subprocess
+import argparse
+import os
+import re
 import sys
-from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
 
+from scan_core import DebugMatcher, iter_scan
 
-def run_grep(pattern: str, file_types: list[str], label: str) -> list[str]:
-    """Run ripgrep and return matches."""
-    results = []
+# How the built-in scanner walks the tree, like ripgrep (also used by scan_core --all)
+WALK_OPTIONS = {"skip_dirs": (), "gitignore": True, "skip_hidden": True}
 
-    for ft in file_types:
-        try:
-            cmd = ["rg", "-n", "--type", ft, pattern, "."]
-            output = subprocess.run(cmd, capture_output=True, text=True, cwd=Path.cwd())
-            if output.stdout.strip():
-                results.extend(output.stdout.strip().split("\n"))
-        except FileNotFoundError:
-            # Fall back to grep if rg not available
-            pass
+# Matches shown per category
+MAX_PER_CATEGORY = 10
 
-    return results
+# (category, pattern, ripgrep file types)
+CATEGORIES = [
+    ("Debug: console.log", "console\\.log\\(", ["js", "ts"]),
+    ("Debug: print()", "print\\(", ["py"]),
+    ("Debug: debugger", "debugger", ["js", "ts"]),
+    ("Debug: binding.pry", "binding\\.pry", ["ruby"]),
+    ("Debug: dd()", "dd\\(", ["php"]),
+    ("Debug: var_dump()", "var_dump\\(", ["php"]),
+    ("TODO/FIXME comments", "(TODO|FIXME|XXX|HACK):", ["js", "ts", "py", "ruby", "go", "rust"]),
+]
 
+# ripgrep's default globs for the types above, used to classify matches
+TYPE_GLOBS = {
+    "js": ["*.cjs", "*.js", "*.jsx", "*.mjs", "*.vue"],
+    "ts": ["*.cts", "*.mts", "*.ts", "*.tsx"],
+    "py": ["*.py", "*.pyi"],
+    "ruby": ["*.gemspec", "*.rb", "*.rbw", ".irbrc", "Gemfile", "Rakefile", "config.ru"],
+    "php": ["*.php", "*.php3", "*.php4", "*.php5", "*.php7", "*.php8", "*.pht", "*.phtml"],
+    "go": ["*.go"],
+    "rust": ["*.rs"],
+}
 
-def main():
-    findings = {}
-
-    # Debug statements
-    debug_patterns = [
-        ("console\\.log\\(", ["js", "ts", "tsx"], "console.log"),
-        ("print\\(", ["py"], "print()"),
-        ("debugger", ["js", "ts", "tsx"], "debugger"),
-        ("binding\\.pry", ["ruby"], "binding.pry"),
-        ("dd\\(", ["php"], "dd()"),
-        ("var_dump\\(", ["php"], "var_dump()"),
-    ]
-
-    for pattern, types, label in debug_patterns:
-        matches = run_grep(pattern, types, label)
-        if matches:
-            findings[f"Debug: {label}"] = matches[:10]  # Limit to 10
-
-    # TODO/FIXME comments
-    todo_matches = run_grep("(TODO|FIXME|XXX|HACK):", ["js", "ts", "py", "tsx", "jsx", "rb", "go", "rs"], "TODOs")
-    if todo_matches:
-        findings["TODO/FIXME comments"] = todo_matches[:10]
+DEBUG_MATCHER = DebugMatcher(CATEGORIES, TYPE_GLOBS)
 
-    # Commented-out code (rough heuristic: // followed by code-like patterns)
-    # This is imprecise but catches obvious cases
 
-    # Output results
-    if not findings:
-        print("✓ No loose ends found - looking clean!")
-        return 0
+def file_type(path: str) -> Optional[str]:
+    return DEBUG_MATCHER.file_type(os.path.basename(path))
+
+
+def _text(field: dict) -> str:
+    if "text" in field:
+        return field["text"]
+    return "<non-UTF-8 data>"
+
+
+class SweepResults:
+    """Matches per category, capped at `limit` each (None for no cap)."""
+
+    def __init__(self, limit: Optional[int] = MAX_PER_CATEGORY):
+        self.limit = limit
+        self.findings: dict[str, list[str]] = {label: [] for label, _, _ in CATEGORIES}
+        self.open_categories = len(self.findings)
+
+    def wants(self, label: str) -> bool:
+        return self.limit is None or len(self.findings[label]) < self.limit
+
+    def add(self, label: str, match: str) -> None:
+        matches = self.findings[label]
+        matches.append(match)
+        if len(matches) == self.limit:
+            self.open_categories -= 1
+
+    @property
+    def full(self) -> bool:
+        return self.open_categories == 0
+
+    def result(self) -> dict[str, list[str]]:
+        return {label: matches for label, matches in self.findings.items() if matches}
+
+
+def rg_sweep(root: str = ".", limit: Optional[int] = MAX_PER_CATEGORY) -> dict[str, list[str]]:
+    """Search every category in one ripgrep run.
+
+    Raises FileNotFoundError without rg, and RuntimeError if rg fails (exit
+    status 2, e.g. an unreadable root) while reading its full output.
+    """
+    import json
+    import subprocess
+    import tempfile
+
+    compiled = [(label, re.compile(pattern), set(types)) for label, pattern, types in CATEGORIES]
+    all_types = sorted({t for _, _, types in compiled for t in types})
+
+    cmd = ["rg", "--json", "-n"]
+    for _, pattern, _ in CATEGORIES:
+        cmd += ["-e", pattern]
+    for ft in all_types:
+        cmd += ["--type", ft]
+    cmd.append(".")
+
+    results = SweepResults(limit)
+    # stderr goes to a file: rg may warn about many files, and a full pipe would stall it
+    errors = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors, text=True, cwd=root)
+    finished = False
+    try:
+        for raw in proc.stdout:
+            event = json.loads(raw)
+            if event.get("type") != "match":
+                continue
+            data = event["data"]
+            path = _text(data["path"])
+            line = _text(data["lines"]).rstrip("\r\n")
+            ftype = file_type(path)
+
+            for label, regex, cat_types in compiled:
+                if ftype in cat_types and results.wants(label) and regex.search(line):
+                    results.add(label, f"{path}:{data['line_number']}:{line}")
+
+            if results.full:
+                break
+        else:
+            finished = True
+    finally:
+        if not finished:
+            proc.kill()
+        proc.wait()
+        errors.seek(0)
+        error = errors.read().decode("utf-8", errors="replace").strip()
+        errors.close()
+
+    # Status 1 only means no matches
+    if finished and proc.returncode == 2:
+        raise RuntimeError(error or "rg exited with status 2")
+    return results.result()
+
+
+def findings_from_results(results: Iterable[Tuple[str, Dict[str, Any]]], root: str = ".",
+                          limit: Optional[int] = MAX_PER_CATEGORY) -> dict[str, list[str]]:
+    """Collect scan_core debug-matcher results, stopping once every category is full."""
+    findings = SweepResults(limit)
+    for path, result in results:
+        hits = result.get(DEBUG_MATCHER.name)
+        if not hits:
+            continue
+        display = "./" + os.path.relpath(path, root).replace(os.sep, "/")
+        for label, line_number, line in hits:
+            if findings.wants(label):
+                findings.add(label, f"{display}:{line_number}:{line}")
+        if findings.full:
+            break
+    return findings.result()
+
+
+def python_sweep(root: str = ".", limit: Optional[int] = MAX_PER_CATEGORY,
+                 jobs: Optional[int] = None) -> dict[str, list[str]]:
+    """Search every category without ripgrep; results are in sorted path order.
 
-    print("⚠ Loose ends found:\n")
+    Walks like ripgrep: .gitignore honoured, hidden and binary files skipped.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    results = iter_scan(root, [DEBUG_MATCHER], jobs=jobs, use_cache=False, **WALK_OPTIONS)
+    try:
+        return findings_from_results(results, root, limit)
+    finally:
+        results.close()
 
+
+HUNK_RE = re.compile(r"@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# C-style escapes git uses in quoted paths; \NNN octal escapes are raw bytes
+GIT_ESCAPE_RE = re.compile(rb"\\([0-7]{3}|.)")
+GIT_ESCAPES = {b"a": b"\a", b"b": b"\b", b"t": b"\t", b"n": b"\n", b"v": b"\v", b"f": b"\f", b"r": b"\r"}
+
+
+def diff_path(field: str) -> str:
+    """A path from a `+++ ` diff header, without git's trailing tab or quoting.
+
+    git ends the header with a tab when the path contains a space, and wraps
+    paths with quotes, backslashes or control characters in C-style quotes.
+    """
+    field = field.rstrip("\t")
+    if len(field) < 2 or not field.startswith('"') or not field.endswith('"'):
+        return field
+
+    def unescape(m) -> bytes:
+        code = m.group(1)
+        return bytes([int(code, 8)]) if len(code) == 3 else GIT_ESCAPES.get(code, code)
+
+    return GIT_ESCAPE_RE.sub(unescape, field[1:-1].encode("utf-8")).decode("utf-8", errors="replace")
+
+
+def diff_sweep(base: str, root: str = ".", limit: Optional[int] = MAX_PER_CATEGORY) -> dict[str, list[str]]:
+    """Search only the lines added since base (working tree vs. base, via git diff).
+
+    Raises RuntimeError if git diff fails (e.g. unknown ref, not a repository).
+    """
+    import subprocess
+    import tempfile
+
+    cmd = ["git", "-c", "core.quotepath=off", "diff", "-U0", "--no-color", "--no-ext-diff",
+           "--relative", base, "--"]
+    results = SweepResults(limit)
+    # stderr goes to a file, as in rg_sweep: it is only read once stdout is done
+    errors = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors, cwd=root)
+    patterns = None    # (combined, categories) for the current file, None if not searched
+    display = ""
+    line_number = 0
+    remaining = 0      # added lines left in the current hunk
+    finished = False   # read to EOF, rather than stopped once every category was full
+    try:
+        for raw in proc.stdout:
+            line = raw.decode("utf-8", errors="replace").rstrip("\n").rstrip("\r")
+            if remaining:
+                # -U0 hunks list removed lines first, then exactly `remaining` added lines
+                if line.startswith("+"):
+                    text = line[1:]
+                    if patterns and patterns[0].search(text):
+                        for label, regex in patterns[1]:
+                            if results.wants(label) and regex.search(text):
+                                results.add(label, f"{display}:{line_number}:{text}")
+                    line_number += 1
+                    remaining -= 1
+                continue
+            if line.startswith("diff --git "):
+                patterns = None
+            elif line.startswith("+++ "):
+                target = diff_path(line[4:])
+                ftype = file_type(target) if target.startswith("b/") else None
+                patterns = DEBUG_MATCHER.languages.get(ftype)
+                display = "./" + target[2:]
+            elif line.startswith("@@"):
+                m = HUNK_RE.match(line)
+                if m:
+                    line_number = int(m.group(1))
+                    remaining = int(m.group(2) or 1)
+            if results.full:
+                break
+        else:
+            finished = True
+    finally:
+        if not finished:
+            proc.kill()  # stopped early: git's remaining output is not needed
+        proc.wait()
+        errors.seek(0)
+        error = errors.read().decode("utf-8", errors="replace").strip()
+        errors.close()
+
+    if finished and proc.returncode:
+        raise RuntimeError(error or f"git diff exited with status {proc.returncode}")
+    return results.result()
+
+
+def run_sweep(root: str = ".", engine: str = "auto", limit: Optional[int] = MAX_PER_CATEGORY,
+              jobs: Optional[int] = None) -> dict[str, list[str]]:
+    """Sweep root with ripgrep, or with the built-in scanner when rg is unavailable."""
+    import shutil
+
+    if engine == "rg" or (engine == "auto" and shutil.which("rg")):
+        return rg_sweep(root, limit)
+    if engine == "auto":
+        print("ripgrep (rg) not found; using the built-in scanner", file=sys.stderr)
+    return python_sweep(root, limit, jobs)
+
+
+def format_findings(findings: dict[str, list[str]]) -> str:
+    """Format sweep findings for display."""
+    if not findings:
+        return "✓ No loose ends found - looking clean!"
+
+    lines = ["⚠ Loose ends found:", ""]
     for category, matches in findings.items():
-        print(f"### {category}")
+        lines.append(f"### {category}")
         for match in matches:
-            print(f"  {match}")
-        if len(matches) == 10:
-            print("  ... (showing first 10)")
-        print()
+            lines.append(f"  {match}")
+        if len(matches) == MAX_PER_CATEGORY:
+            lines.append(f"  ... (showing first {MAX_PER_CATEGORY})")
+        lines.append("")
 
     total = sum(len(m) for m in findings.values())
-    print(f"Total: {total} items to review")
+    lines.append(f"Total: {total} items to review")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep for debug statements and TODOs")
+    parser.add_argument("--engine", choices=["auto", "rg", "python"], default="auto",
+                        help="Search engine (default: rg if installed, else built-in)")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Worker processes for the built-in scanner (default: one per CPU)")
+    parser.add_argument("--diff", metavar="BASE",
+                        help="Only search lines added since BASE (e.g. HEAD, main)")
+    args = parser.parse_args()
+
+    if args.diff:
+        try:
+            findings = diff_sweep(args.diff)
+        except FileNotFoundError:
+            print("Error: git not found", file=sys.stderr)
+            return 2
+        except RuntimeError as e:
+            print(f"Error: git diff failed: {e}", file=sys.stderr)
+            return 2
+    else:
+        try:
+            findings = run_sweep(".", args.engine, jobs=args.jobs or None)
+        except FileNotFoundError:
+            print("Error: ripgrep (rg) not found; use --engine python", file=sys.stderr)
+            return 2
+        except RuntimeError as e:
+            print(f"Error: rg failed: {e}", file=sys.stderr)
+            return 2
+
+    # Commented-out code (rough heuristic: // followed by code-like patterns)
+    # This is imprecise but catches obvious cases
 
-    return 1
+    print(format_findings(findings))
+    return 1 if findings else 0
 
 
 if __name__ == "__main__":
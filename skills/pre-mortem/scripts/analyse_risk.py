@@ -4,14 +4,17 @@ Analyse codebase for risk factors before starting a task.
 
 Usage:
     python analyse_risk.py --task "Add payment integration" --path ./src
+    python analyse_risk.py --path ./src --json > findings.jsonl
 """
 
 import argparse
 import os
-import re
+import sys
+from array import array
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List, Dict
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from scan_core import SKIP_DIRS, RiskMatcher, iter_scan
 
 # Risk indicators in code
 RISK_PATTERNS = {
@@ -23,6 +26,21 @@ RISK_PATTERNS = {
     'env_config': [r'\.env', r'environ', r'getenv', r'config\[', r'settings\.'],
 }
 
+# Categories whose findings are reported as HIGH severity (others are MEDIUM)
+HIGH_SEVERITY_CATEGORIES = {'database', 'auth', 'payment'}
+
+DEFAULT_EXTENSIONS = ['.py', '.js', '.ts', '.tsx', '.jsx', '.go', '.rb', '.java']
+
+# How scans walk the tree (also used by scan_core --all)
+WALK_OPTIONS = {'skip_dirs': SKIP_DIRS}
+
+# Findings kept per category for the report; the rest are only counted
+SAMPLE_SIZE = 5
+
+# Scans summarise each file (counts plus a sample), which is also what gets cached
+RISK_MATCHER = RiskMatcher(RISK_PATTERNS, DEFAULT_EXTENSIONS, HIGH_SEVERITY_CATEGORIES,
+                           sample_size=SAMPLE_SIZE)
+
 # Keywords that suggest high-risk tasks
 HIGH_RISK_KEYWORDS = [
     'migration', 'payment', 'auth', 'security', 'delete', 'production',
@@ -34,8 +52,7 @@ MEDIUM_RISK_KEYWORDS = [
 ]
 
 
-@dataclass
-class RiskFinding:
+class RiskFinding(NamedTuple):
     category: str
     file_path: str
     line_number: int
@@ -43,27 +60,18 @@ class RiskFinding:
     severity: str
 
 
-def scan_file(path: Path, patterns: Dict[str, List[str]]) -> List[RiskFinding]:
-    """Scan a single file for risk patterns."""
-    findings = []
+def scan_file(path: Path, patterns: Dict[str, List[str]] = RISK_PATTERNS,
+              matcher: RiskMatcher = None) -> List[RiskFinding]:
+    """Scan a single file for risk patterns (see RiskMatcher.match_text)."""
+    if matcher is None:
+        matcher = RISK_MATCHER if patterns is RISK_PATTERNS else RiskMatcher(
+            patterns, DEFAULT_EXTENSIONS, HIGH_SEVERITY_CATEGORIES)
     try:
-        content = path.read_text(encoding='utf-8', errors='ignore')
-        lines = content.split('\n')
-
-        for category, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                for i, line in enumerate(lines, 1):
-                    if re.search(pattern, line, re.IGNORECASE):
-                        findings.append(RiskFinding(
-                            category=category,
-                            file_path=str(path),
-                            line_number=i,
-                            pattern_matched=pattern,
-                            severity='HIGH' if category in ['database', 'auth', 'payment'] else 'MEDIUM'
-                        ))
+        content = Path(path).read_text(encoding='utf-8', errors='ignore')
     except Exception:
-        pass
-    return findings
+        return []
+    return [RiskFinding(category, str(path), line_number, pattern, severity)
+            for category, line_number, pattern, severity in matcher.match_text(content)]
 
 
 def analyse_task_risk(task: str) -> Dict[str, str]:
@@ -82,28 +90,129 @@ def analyse_task_risk(task: str) -> Dict[str, str]:
     return risks
 
 
-def scan_codebase(path: str, extensions: List[str] = None) -> List[RiskFinding]:
-    """Scan codebase for risk patterns."""
-    if extensions is None:
-        extensions = ['.py', '.js', '.ts', '.tsx', '.jsx', '.go', '.rb', '.java']
-
-    root = Path(path)
-    if not root.exists():
-        return []
-
-    findings = []
-    skip_dirs = {'node_modules', 'venv', '.venv', '__pycache__', '.git', 'dist', 'build'}
-
-    for ext in extensions:
-        for file_path in root.rglob(f'*{ext}'):
-            if any(skip in file_path.parts for skip in skip_dirs):
-                continue
-            findings.extend(scan_file(file_path, RISK_PATTERNS))
-
-    return findings
-
-
-def format_output(task: str, task_risks: Dict, code_findings: List[RiskFinding]) -> str:
+class FindingsStore:
+    """Findings aggregated as they arrive: a count per category plus the
+    first SAMPLE_SIZE findings of each, in walk order.
+
+    Memory stays flat however many lines match. Sampled findings are held
+    in array columns of interned path and pattern ids rather than one
+    RiskFinding per hit.
+    """
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.counts: Dict[str, int] = {}
+        self.severities: Dict[str, str] = {}  # category -> severity of its first finding
+        self.paths: List[str] = []
+        self.patterns: List[str] = []
+        self._path_ids: Dict[str, int] = {}
+        self._pattern_ids: Dict[str, int] = {}
+        # category -> (path ids, line numbers, pattern ids) of its sample
+        self._samples: Dict[str, Tuple[array, array, array]] = {}
+
+    @staticmethod
+    def _intern(value: str, values: List[str], ids: Dict[str, int]) -> int:
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(values)
+            values.append(value)
+        return index
+
+    def _category(self, category: str, severity: str) -> Tuple[array, array, array]:
+        samples = self._samples.get(category)
+        if samples is None:
+            self.counts[category] = 0
+            self.severities[category] = severity
+            samples = self._samples[category] = (array('L'), array('L'), array('L'))
+        return samples
+
+    def _sample(self, samples: Tuple[array, array, array], path: str, line_number: int,
+                pattern: str) -> None:
+        path_ids, line_numbers, pattern_ids = samples
+        if len(path_ids) < self.sample_size:
+            path_ids.append(self._intern(path, self.paths, self._path_ids))
+            line_numbers.append(line_number)
+            pattern_ids.append(self._intern(pattern, self.patterns, self._pattern_ids))
+
+    def add(self, category: str, path: str, line_number: int, pattern: str, severity: str) -> None:
+        samples = self._category(category, severity)
+        self.counts[category] += 1
+        self._sample(samples, path, line_number, pattern)
+
+    def add_summary(self, path: str, summary: List[list]) -> None:
+        """Add a file's RiskMatcher summary ([category, count, severity, sample] rows)."""
+        for category, count, severity, sample in summary:
+            samples = self._category(category, severity)
+            self.counts[category] += count
+            for line_number, pattern in sample:
+                self._sample(samples, path, line_number, pattern)
+
+    def sample(self, category: str) -> List[RiskFinding]:
+        """The first sample_size findings of a category, in walk order."""
+        path_ids, line_numbers, pattern_ids = self._samples[category]
+        severity = self.severities[category]
+        return [RiskFinding(category, self.paths[p], line, self.patterns[q], severity)
+                for p, line, q in zip(path_ids, line_numbers, pattern_ids)]
+
+    def categories(self) -> List[str]:
+        return sorted(self.counts)
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+
+def iter_findings(results: Iterable[Tuple[str, Dict[str, Any]]],
+                  visitor: str = RISK_MATCHER.name) -> Iterator[RiskFinding]:
+    """Turn scan_core results from a matcher without sample_size into findings, in walk order."""
+    for path, result in results:
+        for category, line_number, pattern, severity in result.get(visitor, ()):
+            yield RiskFinding(category, path, line_number, pattern, severity)
+
+
+def findings_from_results(results: Iterable[Tuple[str, Dict[str, Any]]],
+                          visitor: str = RISK_MATCHER.name) -> FindingsStore:
+    """Aggregate scan_core results (per-file RiskMatcher summaries) into a FindingsStore."""
+    store = FindingsStore()
+    for path, result in results:
+        store.add_summary(path, result.get(visitor, ()))
+    return store
+
+
+def _scan(path: str, extensions: List[str], jobs: int, use_cache: bool,
+          sample_size: Optional[int]):
+    matcher = RISK_MATCHER
+    if extensions is not None or sample_size != SAMPLE_SIZE:
+        matcher = RiskMatcher(RISK_PATTERNS, DEFAULT_EXTENSIONS if extensions is None else extensions,
+                              HIGH_SEVERITY_CATEGORIES, sample_size=sample_size)
+    if not Path(path).exists():
+        return matcher, iter(())
+    return matcher, iter_scan(path, [matcher], jobs=jobs, use_cache=use_cache, **WALK_OPTIONS)
+
+
+def scan_codebase(path: str, extensions: List[str] = None, jobs: int = 1,
+                  use_cache: bool = True) -> FindingsStore:
+    """Scan codebase for risk patterns.
+
+    Files unchanged since the last run are served from the on-disk cache,
+    which holds each file's summary (counts plus a sample), not every hit.
+    With jobs > 1, the remaining files are scanned in batches by a process
+    pool. Findings are merged in walk order, so the result is the same for
+    any number of jobs.
+    """
+    matcher, results = _scan(path, extensions, jobs, use_cache, SAMPLE_SIZE)
+    return findings_from_results(results, matcher.name)
+
+
+def stream_findings(path: str, extensions: List[str] = None, jobs: int = 1) -> Iterator[RiskFinding]:
+    """Every finding, in walk order, without holding them in memory.
+
+    Always rescans: the cache only holds per-file summaries.
+    """
+    matcher, results = _scan(path, extensions, jobs, False, None)
+    return iter_findings(results, matcher.name)
+
+
+def format_output(task: str, task_risks: Dict, code_findings: FindingsStore) -> str:
     """Format analysis output."""
     lines = []
     lines.append(f"Risk Analysis: {task}")
@@ -117,18 +226,12 @@ def format_output(task: str, task_risks: Dict, code_findings: List[RiskFinding])
 
     if code_findings:
         lines.append("Codebase Risk Areas:")
-        by_category = {}
-        for f in code_findings:
-            if f.category not in by_category:
-                by_category[f.category] = []
-            by_category[f.category].append(f)
-
-        for category, findings in sorted(by_category.items()):
-            severity = findings[0].severity
-            lines.append(f"  [{severity}] {category}: {len(findings)} occurrences")
-            # Show first 3 files
+        for category in code_findings.categories():
+            severity = code_findings.severities[category]
+            lines.append(f"  [{severity}] {category}: {code_findings.counts[category]} occurrences")
+            # Show the files among the sampled findings
             seen_files = set()
-            for f in findings[:5]:
+            for f in code_findings.sample(category):
                 if f.file_path not in seen_files:
                     lines.append(f"    - {f.file_path}:{f.line_number}")
                     seen_files.add(f.file_path)
@@ -143,13 +246,33 @@ def format_output(task: str, task_risks: Dict, code_findings: List[RiskFinding])
 
 def main():
     parser = argparse.ArgumentParser(description='Analyse codebase for risk factors')
-    parser.add_argument('--task', required=True, help='Task description')
+    parser.add_argument('--task', help='Task description (required for the report, unused with --json)')
     parser.add_argument('--path', default='.', help='Codebase path to analyse')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for scanning (0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Rescan every file instead of using .claude/cache/')
+    parser.add_argument('--json', action='store_true',
+                        help='Stream every finding as one JSON object per line (JSONL); always rescans')
 
     args = parser.parse_args()
+    if not args.json and args.task is None:
+        parser.error('the following arguments are required: --task')
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if args.json:
+        import json
+
+        write = sys.stdout.write
+        try:
+            for finding in stream_findings(args.path, jobs=jobs):
+                write(json.dumps(finding._asdict()) + '\n')
+        except BrokenPipeError:
+            sys.stderr.close()  # reader went away (e.g. piped into head)
+        return
 
     task_risks = analyse_task_risk(args.task)
-    code_findings = scan_codebase(args.path)
+    code_findings = scan_codebase(args.path, jobs=jobs, use_cache=not args.no_cache)
 
     print(format_output(args.task, task_risks, code_findings))
 
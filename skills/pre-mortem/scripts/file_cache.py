@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Persistent per-file result cache for skill scripts.
+
+Results are stored in SQLite under <root>/.claude/cache/ and keyed on the
+file path plus its (mtime, size). With verify_hash, a file whose stat changed
+but whose content did not (e.g. after a checkout) is still a hit.
+
+Rows are looked up one path at a time and pending writes are flushed in
+batches, so memory does not grow with the number of cached files.
+
+A long-running process (the skill daemon) can call FileCache.keep_open() so
+caches stay open (with SQLite's page cache warm) between runs; closing one
+then only flushes.
+
+Copied into the eta, pre-mortem and loose-ends skills next to scan_core.py;
+edit the eta copy and run scripts/check_shared.py --sync.
+
+Usage:
+    with FileCache.open(root, 'my-script:v1') as cache:
+        value = cache.get(path)
+        if value is None:
+            value = compute(path)
+            cache.put(path, value)
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+CACHE_DIR = os.path.join('.claude', 'cache')
+CACHE_FILE = 'file-cache.sqlite'
+
+# Entries kept per namespace; least recently used rows beyond this are evicted
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Database size that triggers eviction of the oldest quarter of all entries
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Pending results written to the database at a time during a run
+WRITE_BATCH_ROWS = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    namespace TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT,
+    value TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (namespace, path)
+)
+"""
+
+
+def content_hash(path: Path) -> str:
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class NullCache:
+    """Stand-in used for --no-cache or when the cache cannot be opened."""
+
+    def get(self, path: Path) -> Optional[Any]:
+        return None
+
+    def put(self, path: Path, value: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FileCache(NullCache):
+    """SQLite-backed cache of JSON-serialisable per-file results."""
+
+    # (db path, namespace) -> open cache, while keep_open() is in effect
+    _open_caches: Optional[dict] = None
+
+    def __init__(self, db_path: Path, namespace: str, verify_hash: bool = False,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        import sqlite3  # deferred: not needed for --no-cache runs
+
+        self.db_path = Path(db_path)
+        self.namespace = namespace
+        self.verify_hash = verify_hash
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(SCHEMA)
+        self._touched = []
+        self._pending = []
+        self.persistent = False
+
+    @classmethod
+    def keep_open(cls) -> None:
+        """Reuse open caches across open()/close() for the rest of this process."""
+        if cls._open_caches is None:
+            cls._open_caches = {}
+
+    @classmethod
+    def open(cls, root, namespace: str, enabled: bool = True, **kwargs) -> NullCache:
+        """Open the cache for a codebase root, or a NullCache if disabled or unavailable."""
+        if not enabled:
+            return NullCache()
+        import sqlite3
+        try:
+            cache_dir = Path(root).resolve() / CACHE_DIR
+            if cls._open_caches is not None:
+                cache = cls._open_caches.get((cache_dir, namespace))
+                if cache is not None:
+                    return cache
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            cache = cls(cache_dir / CACHE_FILE, namespace, **kwargs)
+        except (OSError, sqlite3.Error):
+            return NullCache()
+        if cls._open_caches is not None:
+            cache.persistent = True
+            cls._open_caches[(cache_dir, namespace)] = cache
+        return cache
+
+    def get(self, path: Path) -> Optional[Any]:
+        import sqlite3
+
+        key = str(path)
+        try:
+            row = self.conn.execute(
+                'SELECT mtime_ns, size, hash, value FROM files WHERE namespace = ? AND path = ?',
+                (self.namespace, key)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        mtime_ns, size, stored_hash, value = row
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+            if not (self.verify_hash and stored_hash and st.st_size == size):
+                return None
+            try:
+                if content_hash(path) != stored_hash:
+                    return None
+            except OSError:
+                return None
+            # Same content, new stat: refresh the key so the next run is a fast hit
+            self._pending.append((self.namespace, key, st.st_mtime_ns, st.st_size,
+                                  stored_hash, value, time.time()))
+        else:
+            self._touched.append(key)
+        return json.loads(value)
+
+    def put(self, path: Path, value: Any) -> None:
+        try:
+            st = os.stat(path)
+            hash_ = content_hash(path) if self.verify_hash else None
+        except OSError:
+            return
+        self._pending.append((self.namespace, str(path), st.st_mtime_ns, st.st_size,
+                              hash_, json.dumps(value, separators=(',', ':')), time.time()))
+        if len(self._pending) >= WRITE_BATCH_ROWS:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        """Write pending results now; eviction waits for flush()."""
+        import sqlite3
+
+        pending, self._pending = self._pending, []
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)', pending)
+        except sqlite3.Error:
+            pass
+
+    def flush(self) -> None:
+        """Write pending results, record hits, and enforce the size caps."""
+        import sqlite3
+        pending, touched = self._pending, self._touched
+        self._pending, self._touched = [], []
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)', pending)
+                now = time.time()
+                self.conn.executemany(
+                    'UPDATE files SET last_used = ? WHERE namespace = ? AND path = ?',
+                    [(now, self.namespace, key) for key in touched])
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Flush; a kept-open cache stays open for the next run."""
+        self.flush()
+        if not self.persistent:
+            self.conn.close()
+
+    def _evict(self) -> int:
+        """Apply the entry and size caps; return the number of rows deleted."""
+        deleted = self.conn.execute(
+            'DELETE FROM files WHERE namespace = ? AND path IN ('
+            ' SELECT path FROM files WHERE namespace = ?'
+            ' ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+            (self.namespace, self.namespace, self.max_entries)).rowcount
+
+        page_size = self.conn.execute('PRAGMA page_size').fetchone()[0]
+        page_count = self.conn.execute('PRAGMA page_count').fetchone()[0]
+        free_pages = self.conn.execute('PRAGMA freelist_count').fetchone()[0]
+        if page_size * (page_count - free_pages) > self.max_bytes:
+            total = self.conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+            deleted += self.conn.execute(
+                'DELETE FROM files WHERE rowid IN ('
+                ' SELECT rowid FROM files ORDER BY last_used LIMIT ?)',
+                (max(1, total // 4),)).rowcount
+        return deleted
@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+Shared scanning core for the eta, pre-mortem and loose-ends scripts.
+
+Walks a tree once, reads each file once, and feeds it to pluggable visitors:
+line counter, TODO counter, risk matcher and debug-statement matcher. Each
+script is a thin front-end that picks its visitors and formats the results;
+per-file results are cached under .claude/cache/ (see file_cache.py).
+
+A copy ships with each of the three skills; edit the eta copy
+(scripts/check_shared.py fails if the others drift). Run it directly with
+--all to get the scope, risk and loose-ends reports from a single pass over
+the tree (needs the three skills installed side by side); each report covers
+the same files as its script run on its own.
+
+Usage:
+    python scan_core.py --all --task "Add payment integration" --path ./src
+"""
+
+import fnmatch
+import os
+import re
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from file_cache import FileCache
+
+# Directories never descended into while walking the codebase
+SKIP_DIRS = {'node_modules', 'venv', '.venv', '__pycache__', '.git', 'dist', 'build'}
+
+# A NUL byte in the first block marks a file as binary (as git and ripgrep do)
+BINARY_SNIFF_BYTES = 8192
+
+# Block size for streaming visitors; bounds memory per file whatever its size
+READ_BLOCK_SIZE = 1 << 20
+
+# Bytes carried between blocks when matching markers; longer than any marker match
+MARKER_OVERLAP = 256
+
+# Result key for files not visited: [reason, size in bytes], reason 'binary' or 'too large'
+SKIPPED = 'skipped'
+
+# Files per work item sent to a pool worker; large enough to amortise
+# pickling and scheduling overhead, small enough to keep workers balanced
+SCAN_BATCH_SIZE = 200
+
+# Files looked up in the cache (and their misses visited) at a time, per job;
+# bounds the results held in memory while iterating
+SCAN_WINDOW = 4 * SCAN_BATCH_SIZE
+
+# Script and skill directory of each front-end, for --all
+FRONT_ENDS = {'estimate_task': 'eta', 'analyse_risk': 'pre-mortem', 'sweep': 'loose-ends'}
+
+
+class SourceFile:
+    """One file's raw bytes, decoded to text at most once."""
+
+    __slots__ = ('path', 'data', '_text')
+
+    def __init__(self, path: str, data: bytes):
+        self.path = path
+        self.data = data
+        self._text = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.data.decode('utf-8', errors='replace')
+        return self._text
+
+    @property
+    def is_binary(self) -> bool:
+        return b'\0' in self.data[:BINARY_SNIFF_BYTES]
+
+
+class Visitor:
+    """Base visitor: accepts() picks files by name, visit() returns a JSON-serialisable result.
+
+    Streaming visitors also provide begin(), returning a per-file accumulator
+    with feed(block) and result(); when every visitor for a file streams, the
+    file is read in READ_BLOCK_SIZE blocks and never held whole. Visitors with
+    skip_binary are not run on binary files.
+    """
+
+    name = ''
+    streaming = False
+    skip_binary = False
+
+    def __init__(self, extensions: Iterable[str] = ()):
+        self.extensions = tuple(extensions)
+
+    def accepts(self, filename: str) -> bool:
+        return filename.endswith(self.extensions)
+
+    def config(self) -> Any:
+        """Everything the result depends on; changing it invalidates cached results."""
+        return self.extensions
+
+    @property
+    def cache_key(self) -> str:
+        return f'{self.name}:{zlib.crc32(repr(self.config()).encode()):08x}'
+
+    def visit(self, source: SourceFile) -> Any:
+        raise NotImplementedError
+
+    def begin(self) -> Any:
+        raise NotImplementedError
+
+
+class _NewlineCount:
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+    def feed(self, block: bytes) -> None:
+        self.count += block.count(b'\n')
+
+    def result(self) -> int:
+        return self.count + 1
+
+
+class _MatchCount:
+    """Counts regex matches over blocks, including matches straddling two blocks.
+
+    Only matches starting at least MARKER_OVERLAP bytes before the end of the
+    data seen so far are counted; the tail (plus one byte of context for \\b)
+    is carried into the next block.
+    """
+
+    __slots__ = ('regex', 'count', 'buffer', 'start')
+
+    def __init__(self, regex: 're.Pattern'):
+        self.regex = regex
+        self.count = 0
+        self.buffer = b''
+        self.start = 0  # offset in buffer where the next match may start
+
+    def feed(self, block: bytes) -> None:
+        buffer = self.buffer + block
+        safe = len(buffer) - MARKER_OVERLAP
+        if safe <= self.start:
+            self.buffer = buffer
+            return
+        end = safe
+        for m in self.regex.finditer(buffer, self.start):
+            if m.start() >= safe:
+                break
+            self.count += 1
+            end = max(end, m.end())
+        self.buffer = buffer[safe - 1:]
+        self.start = end - safe + 1
+
+    def result(self) -> int:
+        return self.count + sum(1 for _ in self.regex.finditer(self.buffer, self.start))
+
+
+class LineCounter(Visitor):
+    """Number of lines in the file, counted on raw bytes."""
+
+    name = 'lines'
+    streaming = True
+    skip_binary = True
+
+    def visit(self, source: SourceFile) -> int:
+        return source.data.count(b'\n') + 1
+
+    def begin(self) -> _NewlineCount:
+        return _NewlineCount()
+
+
+class MarkerCounter(Visitor):
+    """Number of TODO-style tech-debt markers in the file, matched on raw bytes."""
+
+    name = 'markers'
+    streaming = True
+    skip_binary = True
+
+    def __init__(self, extensions: Iterable[str] = (), pattern: str = r'\b(TODO|FIXME|HACK|XXX)\b'):
+        super().__init__(extensions)
+        self.pattern = pattern
+        self.regex = re.compile(pattern.encode())
+
+    def config(self) -> Any:
+        return self.extensions, self.pattern
+
+    def visit(self, source: SourceFile) -> int:
+        return sum(1 for _ in self.regex.finditer(source.data))
+
+    def begin(self) -> _MatchCount:
+        return _MatchCount(self.regex)
+
+
+def _lowercase_literals(pattern: str) -> str:
+    """Lowercase a regex, leaving escape sequences like \\S or \\W untouched."""
+    out = []
+    escaped = False
+    for ch in pattern:
+        out.append(ch if escaped else ch.lower())
+        escaped = ch == '\\' and not escaped
+    return ''.join(out)
+
+
+class RiskMatcher(Visitor):
+    """Case-insensitive risk patterns; yields [category, line, pattern, severity] hits.
+
+    With sample_size, a file's result is a summary instead of every hit:
+    [category, count, severity, [[line, pattern], ...]] per category, keeping
+    the first sample_size hits. That is what gets cached, so cache size does
+    not grow with the number of hits.
+    """
+
+    name = 'risk'
+
+    def __init__(self, patterns: Dict[str, List[str]], extensions: Iterable[str] = (),
+                 high_severity: Iterable[str] = (), sample_size: Optional[int] = None):
+        super().__init__(extensions)
+        self.patterns = patterns
+        self.high_severity = set(high_severity)
+        self.sample_size = sample_size
+        self.entries = []  # (category, pattern, regex, severity)
+        for category, pattern_list in patterns.items():
+            severity = 'HIGH' if category in self.high_severity else 'MEDIUM'
+            for pattern in pattern_list:
+                self.entries.append((category, pattern, re.compile(pattern, re.IGNORECASE), severity))
+
+        # One alternation over every pattern finds candidate lines in a single pass.
+        # Matching lowercased text without IGNORECASE lets re skip ahead on the
+        # branches' first characters, which is several times faster.
+        combined = '|'.join(f'(?:{entry[1]})' for entry in self.entries)
+        self.combined = re.compile(_lowercase_literals(combined))
+        self.combined_ignorecase = re.compile(combined, re.IGNORECASE)  # when lowercasing changes length
+
+    def config(self) -> Any:
+        return self.extensions, self.patterns, sorted(self.high_severity), self.sample_size
+
+    def visit(self, source: SourceFile) -> List[list]:
+        hits = self.match_text(source.text)
+        return hits if self.sample_size is None else self.summarise(hits)
+
+    def summarise(self, hits: List[list]) -> List[list]:
+        """Per-category [category, count, severity, sample] for a file's hits, in hit order."""
+        summary = {}
+        for category, line_number, pattern, severity in hits:
+            entry = summary.get(category)
+            if entry is None:
+                entry = summary[category] = [category, 0, severity, []]
+            entry[1] += 1
+            if len(entry[3]) < self.sample_size:
+                entry[3].append([line_number, pattern])
+        return list(summary.values())
+
+    def match_text(self, content: str) -> List[list]:
+        """Hits in category -> pattern -> line order, as a pattern-by-pattern scan reports them.
+
+        The combined regex walks the content once to find candidate lines;
+        only those lines are checked against the individual patterns.
+        """
+        folded = content.lower()
+        if len(folded) == len(content):
+            candidates = self.combined.finditer(folded)
+        else:
+            candidates = self.combined_ignorecase.finditer(content)
+
+        hits = []
+        line_number = 1
+        scanned_to = 0
+        line_end = -1
+        for match in candidates:
+            if match.start() <= line_end:
+                continue  # line already checked
+            line_number += content.count('\n', scanned_to, match.start())
+            line_start = content.rfind('\n', 0, match.start()) + 1
+            line_end = content.find('\n', match.start())
+            if line_end == -1:
+                line_end = len(content)
+            scanned_to = line_start
+            line = content[line_start:line_end]
+            for entry_index, (_, _, regex, _) in enumerate(self.entries):
+                if regex.search(line):
+                    hits.append((entry_index, line_number))
+
+        hits.sort()
+        return [[self.entries[i][0], line_number, self.entries[i][1], self.entries[i][3]]
+                for i, line_number in hits]
+
+
+class DebugMatcher(Visitor):
+    """Per-language debug/TODO patterns; yields [category, line, text] hits.
+
+    categories is a list of (label, pattern, languages) and type_globs maps
+    each language to ripgrep-style globs (`*.ext` or exact file names).
+    Binary files are skipped.
+    """
+
+    name = 'debug'
+
+    def __init__(self, categories: List[Tuple[str, str, List[str]]], type_globs: Dict[str, List[str]]):
+        super().__init__()
+        self.categories = categories
+        self.type_globs = type_globs
+        self.extension_types = {g[1:]: t for t, globs in type_globs.items() for g in globs if g.startswith('*.')}
+        self.name_types = {g: t for t, globs in type_globs.items() for g in globs if not g.startswith('*')}
+        # Per language: one combined regex for all its patterns, plus per-category regexes
+        self.languages = {}
+        for ftype in type_globs:
+            regexes = [(label, re.compile(pattern)) for label, pattern, types in categories if ftype in types]
+            combined = re.compile('|'.join(f'(?:{regex.pattern})' for _, regex in regexes))
+            self.languages[ftype] = (combined, regexes)
+
+    def config(self) -> Any:
+        return self.categories, self.type_globs
+
+    def file_type(self, filename: str) -> Optional[str]:
+        return self.name_types.get(filename) or self.extension_types.get(os.path.splitext(filename)[1])
+
+    def accepts(self, filename: str) -> bool:
+        return self.file_type(filename) is not None
+
+    def visit(self, source: SourceFile) -> List[list]:
+        if source.is_binary:
+            return []
+        text = source.text
+        combined, regexes = self.languages[self.file_type(os.path.basename(source.path))]
+        hits = []
+        line_number = 1
+        counted_to = 0
+        pos = 0
+        while True:
+            m = combined.search(text, pos)
+            if m is None:
+                break
+            start = text.rfind('\n', 0, m.start()) + 1
+            end = text.find('\n', m.end())
+            if end < 0:
+                end = len(text)
+            line_number += text.count('\n', counted_to, start)
+            counted_to = start
+            line = text[start:end].rstrip('\r')
+            for label, regex in regexes:
+                if regex.search(line):
+                    hits.append([label, line_number, line])
+            pos = end + 1
+        return hits
+
+
+def _read_gitignore(path: str) -> List[Tuple[bool, bool, bool, str]]:
+    """Parse a .gitignore into (negate, dir_only, anchored, pattern) rules.
+
+    Covers the common subset: comments, negation, trailing-slash directory
+    rules, anchored rules (containing a slash) and leading `**/`.
+    """
+    rules = []
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        while line.startswith('**/'):
+            line = line[3:]
+        anchored = '/' in line
+        if line:
+            rules.append((negate, dir_only, anchored, line.lstrip('/')))
+    return rules
+
+
+def _ignored(rules: list, rel_path: str, name: str, is_dir: bool) -> bool:
+    """Apply rules in order (last match wins); each rule's paths are relative to its own .gitignore."""
+    ignored = False
+    for base, negate, dir_only, anchored, pattern in rules:
+        if dir_only and not is_dir:
+            continue
+        target = rel_path[len(base):] if anchored else name
+        if fnmatch.fnmatchcase(target, pattern):
+            ignored = not negate
+    return ignored
+
+
+def walk_files(root: str, accept: Callable[[str], bool], skip_dirs=SKIP_DIRS,
+               gitignore: bool = False, skip_hidden: bool = False) -> Iterator[str]:
+    """Yield accepted files under root in sorted order, in a single walk.
+
+    Skipped directories are pruned as they are found, so their contents are
+    never listed. With gitignore, .gitignore rules are applied per directory;
+    with skip_hidden, dot-files and dot-directories are skipped.
+    """
+    stack = [(str(root), '', [])]
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        if gitignore:
+            ignore_file = os.path.join(directory, '.gitignore')
+            if os.path.isfile(ignore_file):
+                rules = rules + [(rel_dir, *rule) for rule in _read_gitignore(ignore_file)]
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if skip_hidden and name.startswith('.'):
+                continue
+            rel_path = rel_dir + name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in skip_dirs and not (rules and _ignored(rules, rel_path, name, True)):
+                        subdirs.append((entry.path, rel_path + '/', rules))
+                elif accept(name) and entry.is_file() and not (rules and _ignored(rules, rel_path, name, False)):
+                    yield os.path.normpath(entry.path)
+            except OSError:
+                continue
+        # Reversed so the next pop() visits subdirectories in sorted order
+        stack.extend(reversed(subdirs))
+
+
+def walk_order(root: str, path: str) -> List[Tuple[int, str]]:
+    """Sort key putting paths in walk_files order (a directory's files before its subdirectories)."""
+    parts = os.path.relpath(path, root).split(os.sep)
+    return [(1, part) for part in parts[:-1]] + [(0, parts[-1])]
+
+
+def visit_file(path: str, visitors: List[Visitor],
+               max_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Read path once and run every visitor that accepts it; None if unreadable.
+
+    Files over max_size bytes are not read: the result is {SKIPPED: ['too
+    large', size]}. Binary files get {SKIPPED: ['binary', size]} alongside the
+    results of any visitors that do not skip them.
+    """
+    name = os.path.basename(path)
+    active = [v for v in visitors if v.accepts(name)]
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if max_size is not None and size > max_size:
+                return {SKIPPED: ['too large', size]}
+            if active and all(v.streaming for v in active):
+                return _stream_file(f, active, size)
+            data = f.read()
+    except OSError:
+        return None
+    source = SourceFile(path, data)
+    if any(v.skip_binary for v in active) and source.is_binary:
+        result = {v.name: v.visit(source) for v in active if not v.skip_binary}
+        result[SKIPPED] = ['binary', size]
+        return result
+    return {v.name: v.visit(source) for v in active}
+
+
+def _stream_file(f, visitors: List[Visitor], size: int) -> Dict[str, Any]:
+    """Feed an open file to streaming visitors block by block."""
+    block = f.read(READ_BLOCK_SIZE)
+    if b'\0' in block[:BINARY_SNIFF_BYTES] and any(v.skip_binary for v in visitors):
+        visitors = [v for v in visitors if not v.skip_binary]
+        skipped = True
+    else:
+        skipped = False
+    accumulators = [(v.name, v.begin()) for v in visitors]
+    while block and accumulators:
+        for _, accumulator in accumulators:
+            accumulator.feed(block)
+        block = f.read(READ_BLOCK_SIZE)
+    result = {name: accumulator.result() for name, accumulator in accumulators}
+    if skipped:
+        result[SKIPPED] = ['binary', size]
+    return result
+
+
+def _visit_batch(paths: List[str], visitors: List[Visitor],
+                 max_size: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+    """Visit a batch of files (runs in a pool worker)."""
+    return [visit_file(path, visitors, max_size) for path in paths]
+
+
+def _visit_all(paths: List[str], visitors: List[Visitor], pool=None,
+               max_size: Optional[int] = None) -> Iterator[Optional[Dict[str, Any]]]:
+    if pool is None or len(paths) <= SCAN_BATCH_SIZE:
+        for path in paths:
+            yield visit_file(path, visitors, max_size)
+        return
+    batches = [paths[i:i + SCAN_BATCH_SIZE] for i in range(0, len(paths), SCAN_BATCH_SIZE)]
+    for results in pool.map(_visit_batch, batches, [visitors] * len(batches),
+                            [max_size] * len(batches)):
+        yield from results
+
+
+def iter_scan(root: str, visitors: List[Visitor], files: Optional[Iterable[str]] = None,
+              jobs: int = 1, use_cache: bool = True, max_file_size: Optional[int] = None,
+              **walk_options) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (path, {visitor name: result}) for each file, in walk order.
+
+    Files come from walk_files (walk_options: skip_dirs, gitignore,
+    skip_hidden) unless given. Results for unchanged files are served from
+    the cache; the rest are read once and visited, in batches across a
+    process pool when jobs > 1. Files larger than max_file_size bytes are
+    reported under SKIPPED instead of being read. Stopping iteration early
+    cancels the remaining work.
+
+    Paths are processed in windows of SCAN_WINDOW files per job, so only one
+    window's results are held at a time.
+    """
+    def accept(name: str) -> bool:
+        return any(v.accepts(name) for v in visitors)
+
+    if files is None:
+        paths = list(walk_files(root, accept, **walk_options))
+    else:
+        paths = [str(f) for f in files if accept(os.path.basename(str(f)))]
+
+    namespace = 'scan_core:' + '+'.join(sorted(v.cache_key for v in visitors)) + f':max={max_file_size}'
+    pool = None
+    if jobs > 1 and len(paths) > SCAN_BATCH_SIZE:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=jobs)
+    window = SCAN_WINDOW * max(1, jobs)
+    try:
+        with FileCache.open(root, namespace, enabled=use_cache) as cache:
+            for start in range(0, len(paths), window):
+                chunk = paths[start:start + window]
+                cached = [cache.get(path) for path in chunk]
+                visited = _visit_all([p for p, hit in zip(chunk, cached) if hit is None],
+                                     visitors, pool, max_file_size)
+                try:
+                    for path, result in zip(chunk, cached):
+                        if result is None:
+                            result = next(visited)
+                            if result is None:
+                                continue  # unreadable
+                            cache.put(path, result)
+                        yield path, result
+                finally:
+                    visited.close()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def scan(root: str, visitors: List[Visitor], **options) -> List[Tuple[str, Dict[str, Any]]]:
+    """iter_scan collected into a list."""
+    return list(iter_scan(root, visitors, **options))
+
+
+def _accepts_any(visitors: List[Visitor]) -> Callable[[str], bool]:
+    return lambda name: any(v.accepts(name) for v in visitors)
+
+
+def _import_front_ends() -> Dict[str, Any]:
+    """Import the three skills' scripts from the skills directory this copy lives in."""
+    import importlib
+    import sys
+    from pathlib import Path
+
+    skills_dir = Path(__file__).resolve().parents[2]
+    modules = {}
+    for module, skill in FRONT_ENDS.items():
+        scripts = skills_dir / skill / 'scripts'
+        if not (scripts / f'{module}.py').exists():
+            raise SystemExit(f"--all needs the {skill} skill installed next to this one (looked in {scripts})")
+        if str(scripts) not in sys.path:
+            sys.path.append(str(scripts))
+        modules[module] = importlib.import_module(module)
+    return modules
+
+
+def main():
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description='Scope, risk and loose-ends reports from one pass')
+    parser.add_argument('--all', action='store_true', required=True,
+                        help='Run the eta, pre-mortem and loose-ends scans together')
+    parser.add_argument('--task', required=True, help='Task description')
+    parser.add_argument('--path', default='.', help='Codebase path to analyse')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for scanning (0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Reread every file instead of using .claude/cache/')
+    parser.add_argument('--max-file-size', type=float, metavar='MB',
+                        help="Skip (and list) files larger than this in the scope report, "
+                             "as estimate_task.py does (default: its default; 0 = no limit)")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    fronts = _import_front_ends()
+    eta, risk, sweep = fronts['estimate_task'], fronts['analyse_risk'], fronts['sweep']
+    core = importlib.import_module('scan_core')  # the module the front-ends share, not __main__
+
+    front_visitors = {
+        'estimate_task': eta.scope_visitors(),
+        'analyse_risk': [risk.RISK_MATCHER],
+        'sweep': [sweep.DEBUG_MATCHER],
+    }
+
+    # Each report covers the files its script walks on its own (the scripts
+    # differ in skipped directories, .gitignore and hidden files); the walks
+    # are cheap next to reading, and every selected file is still read once
+    selected = {}
+    walks = {}
+    for module, visitors in front_visitors.items():
+        options = fronts[module].WALK_OPTIONS
+        walks.setdefault(repr(sorted(options.items())), (options, []))[1].append(module)
+    for options, modules in walks.values():
+        accepts = _accepts_any([v for module in modules for v in front_visitors[module]])
+        for path in core.walk_files(args.path, accepts, **options):
+            name = os.path.basename(path)
+            for module in modules:
+                if any(v.accepts(name) for v in front_visitors[module]):
+                    selected.setdefault(path, set()).add(module)
+
+    max_mb = eta.DEFAULT_MAX_FILE_MB if args.max_file_size is None else args.max_file_size
+    max_file_size = int(max_mb * 1024 * 1024) if max_mb > 0 else None
+    files = sorted(selected, key=lambda path: core.walk_order(args.path, path))
+    visitors = [v for module_visitors in front_visitors.values() for v in module_visitors]
+    results = core.scan(args.path, visitors, files=files, jobs=jobs, use_cache=not args.no_cache,
+                        max_file_size=max_file_size)
+
+    # The size limit is the scope report's; the risk and loose-ends scripts
+    # read large files, so those are visited for them without the limit
+    others = [v for module in ('analyse_risk', 'sweep') for v in front_visitors[module]]
+    too_large = [path for path, result in results
+                 if result.get(core.SKIPPED, [None])[0] == 'too large' and selected[path] - {'estimate_task'}]
+    if too_large:
+        extra = dict(core.scan(args.path, others, files=too_large, jobs=jobs, use_cache=not args.no_cache))
+        results = [(path, {**result, **extra.get(path, {})}) for path, result in results]
+
+    def results_for(module: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return [(path, result) for path, result in results if module in selected[path]]
+
+    scope = eta.scope_from_results(results_for('estimate_task'))
+    print(eta.format_output(args.task, scope, eta.estimate_task(args.task, scope)))
+    print()
+    print(risk.format_output(args.task, risk.analyse_task_risk(args.task),
+                             risk.findings_from_results(results_for('analyse_risk'))))
+    print()
+    print(sweep.format_findings(sweep.findings_from_results(results_for('sweep'), args.path)))
+
+
+if __name__ == '__main__':
+    main()